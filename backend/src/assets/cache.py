@@ -0,0 +1,142 @@
+"""
+cache.py
+
+Persistent content-hash cache for image descriptions and text embeddings.
+
+Descriptions are keyed by sha256(image bytes) + model, embeddings by
+sha256(text) + model, so re-uploading an identical file or caption never
+pays for another OpenAI round trip. Backed by a local SQLite file.
+
+Embeddings additionally go through a small in-memory LRU keyed by the text
+with whitespace and casing normalized, so those variants reuse a prior result.
+Any other difference is a miss: texts that differ by a word or a number can
+mean different things and must not share an embedding.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+CACHE_PATH = Path(os.getenv('OPENAI_CACHE_PATH', Path(__file__).parent.parent.parent / '.openai-cache.sqlite3'))
+
+# Entries kept in the in-memory normalized-text LRU
+NORMALIZED_CACHE_SIZE = 1000
+
+# Serializes use of the shared SQLite connection; the normalized-text LRU has its own lock
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _connect() -> sqlite3.Connection:
+    """Open the cache database once and create its tables."""
+    conn = sqlite3.connect(CACHE_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS desc_cache ('
+        'hash TEXT NOT NULL, model TEXT NOT NULL, description TEXT NOT NULL, PRIMARY KEY (hash, model))'
+    )
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS embedding_cache ('
+        'hash TEXT NOT NULL, model TEXT NOT NULL, embedding BLOB NOT NULL, PRIMARY KEY (hash, model))'
+    )
+    return conn
+
+
+def content_hash(data: bytes) -> str:
+    """Return the hex SHA-256 of raw content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """Return the hex SHA-256 of a text."""
+    return content_hash(text.encode('utf-8'))
+
+
+def get_description(image_hash: str, model: str) -> str | None:
+    """Return the cached description for an image hash, if any."""
+    with _lock:
+        row = _connect().execute(
+            'SELECT description FROM desc_cache WHERE hash = ? AND model = ?',
+            (image_hash, model),
+        ).fetchone()
+    return row[0] if row else None
+
+
+def put_description(image_hash: str, model: str, description: str) -> None:
+    """Store a description for an image hash."""
+    with _lock:
+        _connect().execute(
+            'INSERT OR REPLACE INTO desc_cache (hash, model, description) VALUES (?, ?, ?)',
+            (image_hash, model, description),
+        )
+
+
+class _NormalizedLRU:
+    """Thread-safe LRU of embeddings keyed by model and whitespace/case-normalized text; hits move to the front."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._entries: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return ' '.join(text.split()).casefold()
+
+    def get(self, text: str, model: str) -> list[float] | None:
+        key = (model, self._normalize(text))
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+            return embedding
+
+    def put(self, text: str, model: str, embedding: list[float]) -> None:
+        key = (model, self._normalize(text))
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+
+_normalized = _NormalizedLRU(NORMALIZED_CACHE_SIZE)
+
+
+def get_embeddings(texts: list[str], model: str) -> list[list[float] | None]:
+    """Return the cached embedding for each text (exact, then normalized text), or None on a miss."""
+    hashes = [text_hash(text) for text in texts]
+    found: dict[str, list[float]] = {}
+    with _lock:
+        conn = _connect()
+        for digest in set(hashes):
+            row = conn.execute(
+                'SELECT embedding FROM embedding_cache WHERE hash = ? AND model = ?',
+                (digest, model),
+            ).fetchone()
+            if row:
+                found[digest] = array('f', row[0]).tolist()
+    results = [found.get(h) for h in hashes]
+    for i, text in enumerate(texts):
+        if results[i] is None:
+            results[i] = _normalized.get(text, model)
+        else:
+            _normalized.put(text, model, results[i])
+    return results
+
+
+def put_embeddings(texts: list[str], model: str, embeddings: list[list[float]]) -> None:
+    """Store embeddings (as float32 blobs) for the given texts."""
+    rows = [(text_hash(text), model, array('f', embedding).tobytes()) for text, embedding in zip(texts, embeddings, strict=True)]
+    with _lock:
+        _connect().executemany(
+            'INSERT OR REPLACE INTO embedding_cache (hash, model, embedding) VALUES (?, ?, ?)',
+            rows,
+        )
+    for text, embedding in zip(texts, embeddings, strict=True):
+        _normalized.put(text, model, embedding)
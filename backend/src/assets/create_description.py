@@ -10,7 +10,10 @@ prewritten fallback description instead of crashing.
 """
 
 import argparse
+import asyncio
 import base64
+import hashlib
+import io
 import logging
 import os
 import sys
@@ -19,12 +22,32 @@ from pathlib import Path
 from openai import (
     APIConnectionError,
     APIError,
-    OpenAI,
+    AsyncOpenAI,
     RateLimitError,
 )
 
+from assets import cache
+from openai_client import get_async_openai_client, get_openai_client
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; images are then sent at full size
+    Image = None
+
 DEFAULT_MODEL = 'gpt-4o-mini'
 
+# Resolved once at import (main loads .env before importing routers)
+_HAS_KEY = bool(os.environ.get('OPENAI_API_KEY'))
+
+# Upper bound on concurrent vision requests in describe_images()
+MAX_CONCURRENCY = 8
+
+# Read size for streaming base64; a multiple of 3 so chunks encode without padding
+ENCODE_CHUNK_SIZE = 57 * 1024
+
+# Longest side sent to the vision model; it downsamples larger images anyway
+MAX_IMAGE_SIDE = 1024
+
 
 FALLBACK_DESCRIPTION = (
     'A generic image showing a scene whose detailed description could not be '
@@ -36,13 +59,107 @@ FALLBACK_DESCRIPTION = (
 logger = logging.getLogger(__name__)
 
 
+def _read_image(image_path: str) -> tuple[str, str]:
+    """
+    Stream an image from disk and return (sha256 hex digest, base64 string).
+
+    The file is hashed and encoded in chunks, so the raw bytes are never held
+    in memory next to their base64 form.
+    """
+    path = Path(image_path)
+    if not path.exists():
+        raise FileNotFoundError(f'Image not found: {image_path}')
+    digest = hashlib.sha256()
+    buf = bytearray()
+    with path.open('rb') as f:
+        while chunk := f.read(ENCODE_CHUNK_SIZE):
+            digest.update(chunk)
+            buf += base64.b64encode(chunk)
+    return digest.hexdigest(), buf.decode('ascii')
+
+
 def encode_image_to_base64(image_path: str) -> str:
     """Read image bytes from disk and return base64-encoded string."""
+    return _read_image(image_path)[1]
+
+
+def _downscale_image(path: Path) -> tuple[str, bytes] | None:
+    """
+    Return (mime type, encoded bytes) of the image shrunk to fit MAX_IMAGE_SIDE.
+
+    Returns None when Pillow is not installed, the file is not a readable image,
+    or it is already small enough. Images with transparency stay PNG, others become JPEG.
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as im:
+            if max(im.size) <= MAX_IMAGE_SIDE:
+                return None
+            im.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            if im.mode in ('RGBA', 'LA') or 'transparency' in im.info:
+                im.save(buf, 'PNG', optimize=True)
+                return 'image/png', buf.getvalue()
+            im.convert('RGB').save(buf, 'JPEG', quality=85)
+            return 'image/jpeg', buf.getvalue()
+    except OSError as e:
+        logger.debug("Could not downscale %s: %s", path, e)
+        return None
+
+
+def _prepare_image(image_path: str, image_url: str | None) -> tuple[str, str]:
+    """
+    Return (sha256 hex digest, URL to send to the model) for an image.
+
+    A publicly reachable `image_url` is sent as-is and the file is only hashed;
+    otherwise the image is inlined as a base64 data URL, downscaled first if large.
+    The hash always covers the original file, so cache hits do not depend on resizing.
+    """
     path = Path(image_path)
+    if image_url is None and (small := _downscale_image(path)) is None:
+        image_hash, b64_image = _read_image(image_path)
+        return image_hash, f'data:image/jpeg;base64,{b64_image}'
     if not path.exists():
         raise FileNotFoundError(f'Image not found: {image_path}')
     with path.open('rb') as f:
-        return base64.b64encode(f.read()).decode('utf-8')
+        image_hash = hashlib.file_digest(f, 'sha256').hexdigest()
+    if image_url is not None:
+        return image_hash, image_url
+    mime, data = small
+    return image_hash, f'data:{mime};base64,{base64.b64encode(data).decode("ascii")}'
+
+
+SYSTEM_MSG = {
+    'role': 'system',
+    'content': (
+        'You are a precise computer vision assistant. '
+        'Given an image, you write a detailed, factual description. '
+        'Mention: overall scene, objects, colors, text in the image, '
+        'spatial relationships, and any relevant fine details. '
+        'Do not speculate beyond what is visible.'
+    ),
+}
+
+USER_TEXT_MSG = {
+    'type': 'text',
+    'text': (
+        'Look at this image and describe it in detail. '
+        'Include all notable objects, their colors, approximate positions, '
+        'any visible text, and how elements relate to each other.'
+    ),
+}
+
+
+def _build_messages(image_url: str) -> list[dict]:
+    """Build the chat messages for `image_url`; only the image part is allocated per call."""
+    return [
+        SYSTEM_MSG,
+        {
+            'role': 'user',
+            'content': [USER_TEXT_MSG, {'type': 'image_url', 'image_url': {'url': image_url}}],
+        },
+    ]
 
 
 def describe_image(
@@ -50,54 +167,33 @@ def describe_image(
     model: str = DEFAULT_MODEL,
     max_tokens: int = 600,
     fallback_description: str = FALLBACK_DESCRIPTION,
+    image_url: str | None = None,
 ) -> str:
     """
     Send the image to an OpenAI vision model and get a detailed description.
 
-    If any OpenAI-related error occurs, return `fallback_description`.
+    If `image_url` is a public URL serving the same file, the model fetches it
+    directly instead of receiving the image inline as base64.
+
+    Descriptions are cached by image content hash, so identical files are only
+    described once. If any OpenAI-related error occurs, return `fallback_description`.
     """
-    if 'OPENAI_API_KEY' not in os.environ:
+    image_hash, url = _prepare_image(image_path, image_url)
+    cached = cache.get_description(image_hash, model)
+    if cached is not None:
+        logger.info("Using cached description for %s", image_path)
+        return cached
+
+    if not _HAS_KEY:
         # No key at all – just return fallback
         msg = 'OPENAI_API_KEY not set, using fallback description.'
         print(f'[warn] {msg}', file=sys.stderr)
         logger.warning(msg)
         return fallback_description
 
-    client = OpenAI()  # uses OPENAI_API_KEY
-
-    # Encode local image as base64 and wrap in data URL
-    b64_image = encode_image_to_base64(image_path)
-    data_url = f'data:image/jpeg;base64,{b64_image}'
+    client = get_openai_client()  # uses OPENAI_API_KEY
 
-    messages = [
-        {
-            'role': 'system',
-            'content': (
-                'You are a precise computer vision assistant. '
-                'Given an image, you write a detailed, factual description. '
-                'Mention: overall scene, objects, colors, text in the image, '
-                'spatial relationships, and any relevant fine details. '
-                'Do not speculate beyond what is visible.'
-            ),
-        },
-        {
-            'role': 'user',
-            'content': [
-                {
-                    'type': 'text',
-                    'text': (
-                        'Look at this image and describe it in detail. '
-                        'Include all notable objects, their colors, approximate positions, '
-                        'any visible text, and how elements relate to each other.'
-                    ),
-                },
-                {
-                    'type': 'image_url',
-                    'image_url': {'url': data_url},
-                },
-            ],
-        },
-    ]
+    messages = _build_messages(url)
 
     try:
         response = client.chat.completions.create(
@@ -107,6 +203,7 @@ def describe_image(
         )
         description = response.choices[0].message.content.strip()
         logger.info("Generated description for %s", image_path)
+        cache.put_description(image_hash, model, description)
         return description
 
     except (RateLimitError, APIConnectionError, APIError) as e:
@@ -128,6 +225,84 @@ def describe_image(
         return fallback_description
 
 
+async def _adescribe(
+    client: AsyncOpenAI | None,
+    image_path: str,
+    image_url: str | None,
+    sem: asyncio.Semaphore,
+    *,
+    model: str,
+    max_tokens: int,
+    fallback_description: str,
+) -> str:
+    """
+    Describe one image while holding a slot of `sem`; caches and falls back like `describe_image`.
+
+    As there, a missing image file raises FileNotFoundError instead of producing the fallback.
+    The SQLite cache calls run in a worker thread so they never block the event loop.
+    """
+    async with sem:
+        image_hash, url = await asyncio.to_thread(_prepare_image, image_path, image_url)
+        cached = await asyncio.to_thread(cache.get_description, image_hash, model)
+        if cached is not None:
+            logger.info("Using cached description for %s", image_path)
+            return cached
+        if client is None:
+            return fallback_description
+
+        try:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=_build_messages(url),
+                max_tokens=max_tokens,
+            )
+            description = response.choices[0].message.content.strip()
+            logger.info("Generated description for %s", image_path)
+            await asyncio.to_thread(cache.put_description, image_hash, model, description)
+            return description
+
+        except (RateLimitError, APIConnectionError, APIError) as e:
+            logger.warning("OpenAI description error for %s (%s): %s", image_path, type(e).__name__, e)
+            return fallback_description
+
+        except Exception as e:
+            logger.warning("Unexpected error while describing %s: %s", image_path, e)
+            return fallback_description
+
+async def describe_images(
+    image_paths: list[str],
+    *,
+    model: str = DEFAULT_MODEL,
+    max_tokens: int = 600,
+    max_concurrency: int = MAX_CONCURRENCY,
+    fallback_description: str = FALLBACK_DESCRIPTION,
+    image_urls: list[str | None] | None = None,
+) -> list[str]:
+    """
+    Describe several images concurrently, at most `max_concurrency` requests in flight.
+
+    `image_urls`, if given, holds a public URL (or None) per path; see `describe_image`.
+    Returns one description per path, in input order; raises FileNotFoundError if a file is missing.
+    """
+    if _HAS_KEY:
+        client = get_async_openai_client()
+    else:
+        # Cached descriptions are still served; everything else falls back
+        logger.warning('OPENAI_API_KEY not set, using fallback descriptions.')
+        client = None
+
+    if image_urls is None:
+        image_urls = [None] * len(image_paths)
+
+    sem = asyncio.Semaphore(max_concurrency)
+    return await asyncio.gather(
+        *[
+            _adescribe(client, path, url, sem, model=model, max_tokens=max_tokens, fallback_description=fallback_description)
+            for path, url in zip(image_paths, image_urls, strict=True)
+        ]
+    )
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description='Generate a detailed description of an image using OpenAI vision models.')
     parser.add_argument(
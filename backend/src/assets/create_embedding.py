@@ -7,6 +7,7 @@ If the OpenAI call fails (quota/network/etc.), use a fallback embedding instead.
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
@@ -15,18 +16,31 @@ import sys
 from openai import (
     APIConnectionError,
     APIError,
-    OpenAI,
+    AsyncOpenAI,
     RateLimitError,
 )
 
+from assets import cache
+from openai_client import get_async_openai_client, get_openai_client
+
 DEFAULT_MODEL = 'text-embedding-3-small'
 
+# Resolved once at import (main loads .env before importing routers)
+_HAS_KEY = bool(os.environ.get('OPENAI_API_KEY'))
+
+# Upper bound on concurrent embedding requests in create_embeddings()
+MAX_CONCURRENCY = 8
+
+# Per-request limits of the embeddings endpoint
+MAX_BATCH_INPUTS = 2048
+MAX_BATCH_TOKENS = 250_000
+
 # NOTE: text-embedding-3-large has 3072 dimensions, small has 1536.
 # Adjust this if you know the exact dim you want.
 FALLBACK_DIM = 1536
 
-# Fallback embedding: simple zero vector
-FALLBACK_EMBEDDING = [0.0] * FALLBACK_DIM
+# Fallback embedding: simple zero vector, a tuple so the shared instance cannot be mutated
+FALLBACK_EMBEDDING = (0.0,) * FALLBACK_DIM
 
 
 logger = logging.getLogger(__name__)
@@ -36,12 +50,94 @@ def create_embedding(text: str, model: str) -> list[float]:
     if not text:
         raise ValueError('Description text is empty after stripping whitespace.')
 
-    if 'OPENAI_API_KEY' not in os.environ:
+    cached = cache.get_embeddings([text], model)[0]
+    if cached is not None:
+        return cached
+
+    if not _HAS_KEY:
         raise RuntimeError('OPENAI_API_KEY is not set in the environment.')
 
-    client = OpenAI()
+    client = get_openai_client()
     response = client.embeddings.create(model=model, input=text)
-    return response.data[0].embedding
+    embedding = response.data[0].embedding
+    cache.put_embeddings([text], model, [embedding])
+    return embedding
+
+
+def _chunk_texts(texts: list[str]) -> list[list[str]]:
+    """Split texts into request-sized batches (input count and estimated token budget)."""
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    for text in texts:
+        # ~4 characters per token is close enough for English captions
+        tokens = len(text) // 4 + 1
+        if current and (len(current) >= MAX_BATCH_INPUTS or current_tokens + tokens > MAX_BATCH_TOKENS):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _fill_missing(embeddings: list[list[float] | None], fresh: list[list[float]]) -> list[list[float]]:
+    """Fill the None slots of cached `embeddings`, in order, with freshly created ones."""
+    remaining = iter(fresh)
+    return [embedding if embedding is not None else next(remaining) for embedding in embeddings]
+
+
+def create_embeddings_batch(texts: list[str], model: str = DEFAULT_MODEL) -> list[list[float]]:
+    """Embed many texts with one API request per batch instead of one per text."""
+    if not all(texts):
+        raise ValueError('Description text is empty after stripping whitespace.')
+
+    embeddings = cache.get_embeddings(texts, model)
+    missing = [text for text, embedding in zip(texts, embeddings, strict=True) if embedding is None]
+    if missing:
+        if not _HAS_KEY:
+            raise RuntimeError('OPENAI_API_KEY is not set in the environment.')
+
+        client = get_openai_client()
+        fresh: list[list[float]] = []
+        for batch in _chunk_texts(missing):
+            response = client.embeddings.create(model=model, input=batch)
+            fresh.extend(d.embedding for d in response.data)
+        cache.put_embeddings(missing, model, fresh)
+        embeddings = _fill_missing(embeddings, fresh)
+    return embeddings
+
+
+async def _aembed(client: AsyncOpenAI, batch: list[str], sem: asyncio.Semaphore, model: str) -> list[list[float]]:
+    """Embed one batch of texts while holding a slot of `sem`."""
+    async with sem:
+        response = await client.embeddings.create(model=model, input=batch)
+        return [d.embedding for d in response.data]
+
+
+async def create_embeddings(
+    texts: list[str],
+    model: str = DEFAULT_MODEL,
+    max_concurrency: int = MAX_CONCURRENCY,
+) -> list[list[float]]:
+    """Embed several texts, sending batched requests concurrently; raises like `create_embedding`."""
+    if not all(texts):
+        raise ValueError('Description text is empty after stripping whitespace.')
+
+    embeddings = await asyncio.to_thread(cache.get_embeddings, texts, model)
+    missing = [text for text, embedding in zip(texts, embeddings, strict=True) if embedding is None]
+    if missing:
+        if not _HAS_KEY:
+            raise RuntimeError('OPENAI_API_KEY is not set in the environment.')
+
+        client = get_async_openai_client()
+        sem = asyncio.Semaphore(max_concurrency)
+        results = await asyncio.gather(*[_aembed(client, batch, sem, model) for batch in _chunk_texts(missing)])
+        fresh = [embedding for batch in results for embedding in batch]
+        await asyncio.to_thread(cache.put_embeddings, missing, model, fresh)
+        embeddings = _fill_missing(embeddings, fresh)
+    return embeddings
 
 
 def parse_args() -> argparse.Namespace:
@@ -1,5 +1,7 @@
+from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import delete, tuple_, update
 from sqlmodel import Session, select
 
 from models import Asset, AssetType
@@ -15,9 +17,14 @@ class AssetRepository:
         """Persist a new asset to the database."""
         self.session.add(asset)
         self.session.commit()
-        self.session.refresh(asset)
         return asset
 
+    def bulk_create(self, assets: list[Asset]) -> list[Asset]:
+        """Persist several assets in a single transaction."""
+        self.session.add_all(assets)
+        self.session.commit()
+        return assets
+
     def get_by_id(self, asset_id: UUID) -> Asset | None:
         """Get an asset by its ID."""
         return self.session.get(Asset, asset_id)
@@ -27,22 +34,44 @@ class AssetRepository:
         skip: int = 0,
         limit: int = 100,
         asset_type: AssetType | None = None,
+        after: tuple[datetime, UUID] | None = None,
     ) -> list[Asset]:
-        """Get all assets with optional filtering and pagination."""
+        """
+        Get assets ordered by (created_at, id) with optional filtering.
+
+        Pass the (created_at, id) of the last asset of a page as `after` to fetch the
+        next one via an index seek instead of scanning `skip` rows.
+        """
         statement = select(Asset)
         if asset_type:
             statement = statement.where(Asset.asset_type == asset_type)
-        statement = statement.offset(skip).limit(limit)
+        if after is not None:
+            statement = statement.where(tuple_(Asset.created_at, Asset.id) > after)
+        elif skip:
+            statement = statement.offset(skip)
+        statement = statement.order_by(Asset.created_at, Asset.id).limit(limit)
         return list(self.session.exec(statement).all())
 
-    def update(self, asset: Asset) -> Asset:
-        """Update an existing asset."""
-        self.session.add(asset)
+    def update_by_id(self, asset_id: UUID, values: dict) -> Asset | None:
+        """Update an asset in one UPDATE ... RETURNING round trip. Returns None if it does not exist."""
+        statement = update(Asset).where(Asset.id == asset_id).values(**values).returning(Asset)
+        asset = self.session.exec(statement).scalar_one_or_none()
+        if asset is not None:
+            # Detach so the commit does not expire the freshly returned row
+            self.session.expunge(asset)
         self.session.commit()
-        self.session.refresh(asset)
         return asset
 
-    def delete(self, asset: Asset) -> None:
-        """Delete an asset from the database."""
-        self.session.delete(asset)
+    def bulk_update(self, asset_ids: list[UUID], values: dict) -> int:
+        """Apply the same field values to several assets with one UPDATE. Returns the number of rows updated."""
+        statement = update(Asset).where(Asset.id.in_(asset_ids)).values(**values)
+        result = self.session.exec(statement)
+        self.session.commit()
+        return result.rowcount
+
+    def delete_by_id(self, asset_id: UUID) -> bool:
+        """Delete an asset with one DELETE ... RETURNING round trip. Returns False if it did not exist."""
+        statement = delete(Asset).where(Asset.id == asset_id).returning(Asset.id)
+        deleted = self.session.exec(statement).scalar_one_or_none()
         self.session.commit()
+        return deleted is not None
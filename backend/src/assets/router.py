@@ -1,30 +1,71 @@
+import asyncio
 import logging
+import os
+import shutil
+from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile
 from fastapi.responses import FileResponse
 from sqlmodel import Session
 
+from assets.create_description import describe_images
+from assets.create_embedding import FALLBACK_EMBEDDING, create_embeddings
 from assets.repository import AssetRepository
 from assets.service import AssetNotFoundError, AssetService
+from campaign_specs.cache import invalidate_spec_cache
 from database import get_session
-from functions.embedding import create_embedding_simple
-from functions.image import describe_image_from_path
-from models import Asset, AssetCreate, AssetType, AssetUpdate
+from models import Asset, AssetBulkUpdate, AssetCreate, AssetType, AssetUpdate
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/assets', tags=['assets'])
 
+# Created on application startup (see main.lifespan)
 ASSET_FILES_DIR = Path(__file__).parent.parent.parent / 'asset-files'
-ASSET_FILES_DIR.mkdir(exist_ok=True)
 
+# Externally reachable base URL of this API (e.g. https://api.example.com). When set,
+# vision models fetch asset files from /assets/files/ instead of receiving base64.
+ASSET_PUBLIC_BASE_URL = os.getenv('ASSET_PUBLIC_BASE_URL')
+
+# Asset files are immutable once uploaded
+ASSET_FILE_CACHE_HEADERS = {'Cache-Control': 'public, max-age=31536000, immutable'}
+
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Uploads larger than this are evicted from the page cache once written
+UNCACHED_UPLOAD_THRESHOLD = 16 << 20
 
 # Image extensions that can be processed for descriptions
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp'}
 
 
+def _copy_upload(source: BinaryIO, destination: Path) -> None:
+    """Copy an uploaded file to disk in fixed-size chunks."""
+    with destination.open('wb') as out:
+        shutil.copyfileobj(source, out, UPLOAD_CHUNK_SIZE)
+        if out.tell() > UNCACHED_UPLOAD_THRESHOLD and hasattr(os, 'posix_fadvise'):
+            # Write-once data: flush it and drop it from the page cache so served files stay cached
+            out.flush()
+            os.fdatasync(out.fileno())
+            os.posix_fadvise(out.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def public_file_url(file_name: str) -> str | None:
+    """Return the public URL of an asset file, or None if the API is not publicly reachable."""
+    if not ASSET_PUBLIC_BASE_URL:
+        return None
+    return f'{ASSET_PUBLIC_BASE_URL.rstrip("/")}{router.prefix}/files/{file_name}'
+
+
+async def save_upload(file: UploadFile, destination: Path) -> None:
+    """Stream an upload to `destination` without blocking the event loop or buffering it in memory."""
+    await asyncio.to_thread(_copy_upload, file.file, destination)
+
+
 async def process_asset_description_and_embedding(
     asset: Asset,
     session: Session,
@@ -34,43 +75,64 @@ async def process_asset_description_and_embedding(
 
     This updates the asset's caption (if not set) and embedding in the database.
     """
-    file_path = ASSET_FILES_DIR / asset.file_name
+    await process_assets_descriptions_and_embeddings([asset], session)
 
-    # Check if it's an image file
-    if file_path.suffix.lower() not in IMAGE_EXTENSIONS:
-        logger.info(f"Asset {asset.id}: Skipping non-image file {asset.file_name}")
-        return
 
-    if not file_path.exists():
-        logger.warning(f"Asset {asset.id}: File not found at {file_path}")
+async def process_assets_descriptions_and_embeddings(
+    assets: list[Asset],
+    session: Session,
+) -> None:
+    """
+    Generate descriptions and embeddings for several assets concurrently.
+
+    The vision and embedding requests of the whole batch overlap instead of
+    running one after another; results are committed in a single transaction.
+    """
+    processable = []
+    for asset in assets:
+        file_path = ASSET_FILES_DIR / asset.file_name
+        if file_path.suffix.lower() not in IMAGE_EXTENSIONS:
+            logger.info(f"Asset {asset.id}: Skipping non-image file {asset.file_name}")
+        elif not file_path.exists():
+            logger.warning(f"Asset {asset.id}: File not found at {file_path}")
+        else:
+            processable.append(asset)
+
+    if not processable:
         return
 
     try:
-        # Generate description if caption is empty or generic
-        description = asset.caption
-        if not description or description.strip() == '':
-            logger.info(f"Asset {asset.id}: Generating description...")
-            desc_output = await describe_image_from_path(str(file_path))
-            description = desc_output.description
-            asset.caption = description
-            logger.info(f"Asset {asset.id}: Description generated ({len(description)} chars)")
-
-        # Generate embedding from description
-        if not asset.embedding or all(v == 0.0 for v in asset.embedding):
-            logger.info(f"Asset {asset.id}: Generating embedding...")
-            embedding = create_embedding_simple(description)
-            asset.embedding = embedding
-            logger.info(f"Asset {asset.id}: Embedding generated ({len(embedding)} dims)")
-
-        session.add(asset)
+        to_describe = [asset for asset in processable if not asset.caption or asset.caption.strip() == '']
+        if to_describe:
+            logger.info(f"Generating descriptions for {len(to_describe)} assets...")
+            descriptions = await describe_images(
+                [str(ASSET_FILES_DIR / asset.file_name) for asset in to_describe],
+                image_urls=[public_file_url(asset.file_name) for asset in to_describe],
+            )
+            for asset, description in zip(to_describe, descriptions, strict=True):
+                asset.caption = description
+
+        to_embed = [asset for asset in processable if not asset.embedding or all(v == 0.0 for v in asset.embedding)]
+        if to_embed:
+            logger.info(f"Generating embeddings for {len(to_embed)} assets...")
+            try:
+                embeddings = await create_embeddings([asset.caption for asset in to_embed])
+            except Exception as e:
+                # Same behaviour as the single-asset path: keep going with a zero vector
+                logger.warning(f"Embedding batch failed, using fallback embeddings - {e}")
+                embeddings = [list(FALLBACK_EMBEDDING) for _ in to_embed]
+            for asset, embedding in zip(to_embed, embeddings, strict=True):
+                asset.embedding = embedding
+
+        session.add_all(processable)
         session.commit()
 
     except Exception as e:
-        logger.error(f"Asset {asset.id}: Error processing - {e}")
+        logger.error(f"Error processing asset batch - {e}")
         session.rollback()
 
 
-def get_asset_service(session: Session = Depends(get_session)) -> AssetService:
+def get_asset_service(session: Session = Depends(get_session, scope='function')) -> AssetService:
     """Dependency injection for AssetService."""
     repository = AssetRepository(session)
     return AssetService(repository)
@@ -93,7 +155,7 @@ async def upload_asset(
     caption: str = Form(default=''),
     tags: str = Form(default=''),  # comma-separated tags
     service: AssetService = Depends(get_asset_service),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope='function'),
 ) -> Asset:
     """Upload a file and create an asset with auto-generated description and embedding."""
     # Generate unique filename
@@ -102,8 +164,7 @@ async def upload_asset(
     file_path = ASSET_FILES_DIR / unique_filename
 
     # Save file
-    content = await file.read()
-    file_path.write_bytes(content)
+    await save_upload(file, file_path)
 
     # Parse tags
     tag_list = [t.strip() for t in tags.split(',') if t.strip()] if tags else []
@@ -120,30 +181,90 @@ async def upload_asset(
 
     # Generate description and embedding
     await process_asset_description_and_embedding(asset, session)
-
-    # Refresh to get updated values
-    session.refresh(asset)
     return asset
 
 
+@router.post('/upload/batch', response_model=list[Asset], status_code=201)
+async def upload_assets(
+    files: list[UploadFile] = File(...),
+    asset_type: AssetType = Form(...),
+    tags: str = Form(default=''),  # comma-separated tags, applied to every file
+    service: AssetService = Depends(get_asset_service),
+    session: Session = Depends(get_session, scope='function'),
+) -> list[Asset]:
+    """Upload several files at once; descriptions and embeddings are generated concurrently."""
+    tag_list = [t.strip() for t in tags.split(',') if t.strip()] if tags else []
+
+    asset_data = []
+    for file in files:
+        file_ext = Path(file.filename or '').suffix
+        unique_filename = f'{uuid4()}{file_ext}'
+        await save_upload(file, ASSET_FILES_DIR / unique_filename)
+
+        asset_data.append(
+            AssetCreate(
+                name=Path(file.filename or unique_filename).stem,
+                file_name=unique_filename,
+                asset_type=asset_type,
+                caption='',
+                tags=tag_list,
+            )
+        )
+    assets = service.create_assets(asset_data)
+
+    await process_assets_descriptions_and_embeddings(assets, session)
+    return assets
+
+
 @router.get('/files/{filename}')
 def get_asset_file(filename: str) -> FileResponse:
     """Serve an asset file."""
     file_path = ASSET_FILES_DIR / filename
-    if not file_path.exists():
+    try:
+        stat_result = file_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail='File not found')
-    return FileResponse(file_path)
+    # Stored names are unique per upload, so the content behind a URL never changes
+    return FileResponse(file_path, stat_result=stat_result, headers=ASSET_FILE_CACHE_HEADERS)
+
+
+def _encode_cursor(asset: Asset) -> str:
+    """Opaque keyset cursor pointing just after `asset`."""
+    return f'{asset.created_at.isoformat()}_{asset.id}'
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Parse a cursor produced by `_encode_cursor`."""
+    try:
+        created_at, asset_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), UUID(asset_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid cursor')
 
 
 @router.get('/', response_model=list[Asset])
 def list_assets(
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=1000),
     asset_type: AssetType | None = Query(default=None),
+    after: str | None = Query(default=None, description='Cursor from the X-Next-Cursor header of the previous page'),
     service: AssetService = Depends(get_asset_service),
 ) -> list[Asset]:
-    """Get all assets with optional filtering and pagination."""
-    return service.list_assets(skip=skip, limit=limit, asset_type=asset_type)
+    """
+    Get all assets with optional filtering and pagination.
+
+    When a page is full, the cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    assets = service.list_assets(
+        skip=skip,
+        limit=limit,
+        asset_type=asset_type,
+        after=_decode_cursor(after) if after else None,
+    )
+    if len(assets) == limit:
+        response.headers['X-Next-Cursor'] = _encode_cursor(assets[-1])
+    return assets
 
 
 @router.get('/{asset_id}', response_model=Asset)
@@ -158,7 +279,17 @@ def get_asset(
         raise HTTPException(status_code=404, detail='Asset not found')
 
 
-@router.patch('/{asset_id}', response_model=Asset)
+@router.patch('/', dependencies=[Depends(invalidate_spec_cache)])
+def update_assets(
+    data: AssetBulkUpdate,
+    service: AssetService = Depends(get_asset_service),
+) -> dict:
+    """Apply the same partial update to several assets at once."""
+    update = AssetUpdate.model_validate(data.model_dump(exclude={'asset_ids'}, exclude_unset=True))
+    return {'updated': service.update_assets(data.asset_ids, update)}
+
+
+@router.patch('/{asset_id}', response_model=Asset, dependencies=[Depends(invalidate_spec_cache)])
 def update_asset(
     asset_id: UUID,
     data: AssetUpdate,
@@ -171,7 +302,7 @@ def update_asset(
         raise HTTPException(status_code=404, detail='Asset not found')
 
 
-@router.delete('/{asset_id}', status_code=204)
+@router.delete('/{asset_id}', status_code=204, dependencies=[Depends(invalidate_spec_cache)])
 def delete_asset(
     asset_id: UUID,
     service: AssetService = Depends(get_asset_service),
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 from assets.repository import AssetRepository
@@ -20,9 +21,15 @@ class AssetService:
 
     def create_asset(self, data: AssetCreate) -> Asset:
         """Create a new asset."""
+        # Table models do not re-run field validation here, and model_validate reads the
+        # fields directly; Asset(**data.model_dump()) would only add a dict copy
         asset = Asset.model_validate(data)
         return self.repository.create(asset)
 
+    def create_assets(self, data: list[AssetCreate]) -> list[Asset]:
+        """Create several assets in one transaction."""
+        return self.repository.bulk_create([Asset.model_validate(item) for item in data])
+
     def get_asset(self, asset_id: UUID) -> Asset:
         """Get an asset by ID. Raises AssetNotFoundError if not found."""
         asset = self.repository.get_by_id(asset_id)
@@ -35,25 +42,30 @@ class AssetService:
         skip: int = 0,
         limit: int = 100,
         asset_type: AssetType | None = None,
+        after: tuple[datetime, UUID] | None = None,
     ) -> list[Asset]:
         """List all assets with optional filtering and pagination."""
-        return self.repository.get_all(skip=skip, limit=limit, asset_type=asset_type)
+        return self.repository.get_all(skip=skip, limit=limit, asset_type=asset_type, after=after)
 
     def update_asset(self, asset_id: UUID, data: AssetUpdate) -> Asset:
         """Update an asset. Raises AssetNotFoundError if not found."""
-        asset = self.repository.get_by_id(asset_id)
+        update_data = data.model_dump(exclude_unset=True)
+        if not update_data:
+            return self.get_asset(asset_id)
+
+        asset = self.repository.update_by_id(asset_id, update_data)
         if not asset:
             raise AssetNotFoundError(asset_id)
+        return asset
 
+    def update_assets(self, asset_ids: list[UUID], data: AssetUpdate) -> int:
+        """Apply the same partial update to several assets. Returns the number of assets updated."""
         update_data = data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(asset, key, value)
-
-        return self.repository.update(asset)
+        if not asset_ids or not update_data:
+            return 0
+        return self.repository.bulk_update(asset_ids, update_data)
 
     def delete_asset(self, asset_id: UUID) -> None:
         """Delete an asset. Raises AssetNotFoundError if not found."""
-        asset = self.repository.get_by_id(asset_id)
-        if not asset:
+        if not self.repository.delete_by_id(asset_id):
             raise AssetNotFoundError(asset_id)
-        self.repository.delete(asset)
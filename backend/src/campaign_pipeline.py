@@ -3,26 +3,33 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
+import os
 import re
+import time
 from collections import defaultdict
-from collections.abc import Sequence
-from contextlib import contextmanager
-from datetime import datetime
+from collections.abc import Iterable, Mapping, Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
-import requests
+import httpx
 from sqlmodel import Session
 
 from database import engine
 from schemas import ImageData
 from steps.evaluate_image_groups import ImageAnalysisResult, analyze_image_differences
 from steps.generate_new_prompt import build_enhanced_prompt
-from steps.generate_step import FluxBatchSession, FluxGenerationError, print_concise_summary
+from steps.generate_step import (
+    FluxBatchSession,
+    FluxGenerationError,
+    load_assets_from_folder,
+    print_concise_summary,
+)
 from steps.get_analytics import get_analytics
-from steps.search_new_assets import DEFAULT_TOP_K, search_new_assets
+from steps.search_new_assets import DEFAULT_TOP_K, search_new_assets_batch
 from steps.select_top_images import select_top_images
 
 logger = logging.getLogger(__name__)
@@ -31,6 +38,24 @@ DEFAULT_IMAGES_PER_GROUP = 5
 DEFAULT_TOP_N = 2
 DEFAULT_ITERATIONS = 2
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Resolved once at import instead of on every run
+_BACKEND_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_OUTPUT_ROOT = _BACKEND_DIR / "generated_images"
+
+# Concurrent image downloads per iteration and per-request timeout (seconds)
+DOWNLOAD_CONCURRENCY = 8
+DOWNLOAD_TIMEOUT = 60
+
+# Download retries for transient failures, with exponential backoff starting at DOWNLOAD_BACKOFF seconds
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_BACKOFF = 0.3
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Bytes written per chunk while streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 def _results_to_images(group: str, raw_images: list[dict[str, Any]]) -> list[ImageData]:
     images: list[ImageData] = []
@@ -42,6 +67,7 @@ def _results_to_images(group: str, raw_images: list[dict[str, Any]]) -> list[Ima
             for asset_class, asset in result.get("assets", {}).items()
         ]
         metadata_tags = asset_tags + [f"target_group:{group}"]
+        # Plain ImageData(...) validates in pydantic-core and is faster than model_construct
         images.append(
             ImageData(
                 id=image_id,
@@ -54,24 +80,28 @@ def _results_to_images(group: str, raw_images: list[dict[str, Any]]) -> list[Ima
 
 
 def _attach_analytics(images: list[ImageData]) -> list[ImageData]:
-    analytics = get_analytics(images)
-    analytics_map = {item.id: item for item in analytics}
-    enriched: list[ImageData] = []
+    """Attach analytics to the (freshly built, unshared) images in place and return them."""
+    analytics_map = {item.id: item for item in get_analytics(images)}
     for image in images:
-        enriched.append(image.model_copy(update={"analytics": analytics_map[image.id]}))
-    return enriched
+        # Bypass validate_assignment: the values are AnalyticsData instances from get_analytics
+        image.__dict__["analytics"] = analytics_map[image.id]
+        image.__pydantic_fields_set__.add("analytics")
+    return images
 
 
-def _build_asset_search_prompt(images: Sequence[ImageData], top_ids: set[str]) -> str:
+def _build_asset_search_prompt(images_by_id: Mapping[str, ImageData], top_ids: Iterable[str]) -> str:
+    """Join the prompts and tags of the top images, looked up by id so the cost follows top_n, not the group size."""
+    # Tags go straight into the buffer so the only string built is the final join
     fragments: list[str] = []
-    for image in images:
-        if image.id not in top_ids:
+    for image_id in top_ids:
+        image = images_by_id.get(image_id)
+        if image is None:
             continue
         if image.final_prompt:
             fragments.append(image.final_prompt)
         if image.metadata_tags:
-            fragments.append(", ".join(image.metadata_tags))
-    return " ".join(fragment for fragment in fragments if fragment).strip()
+            fragments.extend(tag for tag in image.metadata_tags if tag)
+    return " ".join(fragments).strip()
 
 
 def _get_top_ids(analytics_list: Sequence) -> set[str]:
@@ -103,32 +133,53 @@ def _summarize_group(
         print(f"Insight (truncated): {truncated_insight}")
 
 
-@contextmanager
-def _maybe_db_session():
+def _search_assets_batch_safe(
+    prompts: list[str],
+    top_k: int,
+) -> list[list[tuple[Any, float]]]:
+    """Run the batched asset search on its own session, owned by the calling worker thread."""
+    if top_k <= 0:
+        return [[] for _ in prompts]
     try:
-        with Session(engine) as session:
-            yield session
+        with Session(engine) as db_session:
+            return search_new_assets_batch(
+                session=db_session,
+                prompts=prompts,
+                top_k=top_k,
+            )
     except Exception as exc:
-        print(f"[warn] Skipping database-backed asset search: {exc}")
-        yield None
+        print(f"[warn] Asset search failed, continuing without new references: {exc}")
+        return [[] for _ in prompts]
 
 
-def _search_assets_safe(db_session: Session | None, prompt: str, top_k: int):
-    if db_session is None or top_k <= 0:
-        return []
+def _catalog_signature(assets_dir: str) -> tuple[int, ...]:
+    """Modification times of the assets directory and its class folders; any added or removed file changes one."""
+    base = Path(assets_dir).expanduser()
     try:
-        return search_new_assets(
-            session=db_session,
-            prompt=prompt,
-            top_k=top_k,
-        )
-    except Exception as exc:
-        print(f"[warn] Asset search failed, continuing without new references: {exc}")
-        return []
+        with os.scandir(base) as entries:
+            subdirs = sorted(entry.path for entry in entries if entry.is_dir())
+        return (base.stat().st_mtime_ns, *(os.stat(path).st_mtime_ns for path in subdirs))
+    except OSError:
+        return ()
+
+
+@lru_cache(maxsize=4)
+def _scan_asset_catalog(assets_dir: str, signature: tuple[int, ...]) -> dict[str, list[dict[str, Any]]]:
+    return load_assets_from_folder(assets_dir)
+
+
+def _load_asset_catalog(assets_dir: str) -> dict[str, list[dict[str, Any]]]:
+    """
+    Return the asset catalog for a directory, scanning it only when it changed.
+
+    Runs against the same directory reuse the cached scan; the cache key includes
+    the folder modification times, so assets added or removed between runs are picked up.
+    """
+    return _scan_asset_catalog(assets_dir, _catalog_signature(assets_dir))
 
 
 def _slugify(value: str) -> str:
-    slug = re.sub(r"[^a-z0-9]+", "-", value.lower())
+    slug = _SLUG_RE.sub("-", value.lower())
     return slug.strip("-") or "group"
 
 
@@ -139,40 +190,74 @@ def _truncate_text(text: str, limit: int = 280) -> str:
     return text[: limit - 3].rstrip() + "..."
 
 
-def _prepare_output_root(output_dir: str | None) -> Path:
-    if output_dir:
-        base = Path(output_dir)
-    else:
-        base = Path(__file__).resolve().parents[1] / "generated_images"
-    base.mkdir(parents=True, exist_ok=True)
-    timestamp_dir = base / datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    timestamp_dir.mkdir(parents=True, exist_ok=True)
-    return timestamp_dir
+def _prepare_output_root(output_dir: str | None, run_id: str | None = None) -> Path:
+    """Create and return the run directory, named `run_id` or else the current UTC timestamp."""
+    base = Path(output_dir) if output_dir else DEFAULT_OUTPUT_ROOT
+    run_dir = base / (run_id or time.strftime("%Y%m%d_%H%M%S", time.gmtime()))
+    run_dir.mkdir(parents=True, exist_ok=True)
+    return run_dir
 
 
-def _save_images_to_disk(
+def _download_client() -> httpx.AsyncClient:
+    """Client shared by all downloads of a run, so connections are reused across images and iterations."""
+    return httpx.AsyncClient(
+        timeout=DOWNLOAD_TIMEOUT,
+        limits=httpx.Limits(max_connections=DOWNLOAD_CONCURRENCY, max_keepalive_connections=DOWNLOAD_CONCURRENCY),
+        # Retries failed connection attempts; retryable status codes are handled in _fetch_one
+        transport=httpx.AsyncHTTPTransport(retries=DOWNLOAD_RETRIES),
+    )
+
+
+async def _fetch_one(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    target_path: Path,
+) -> str | None:
+    async with semaphore:
+        for attempt in range(DOWNLOAD_RETRIES + 1):
+            try:
+                async with client.stream("GET", url) as response:
+                    if response.status_code in RETRYABLE_STATUS_CODES and attempt < DOWNLOAD_RETRIES:
+                        await asyncio.sleep(DOWNLOAD_BACKOFF * 2**attempt)
+                        continue
+                    response.raise_for_status()
+                    # Stream to disk so a large image is never held in memory as a whole
+                    with target_path.open("wb") as out:
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            out.write(chunk)
+                break
+            except Exception as exc:
+                logger.warning("Failed to save image %s: %s", url, exc)
+                # Do not leave a truncated file that looks like a saved image
+                target_path.unlink(missing_ok=True)
+                return None
+    logger.debug("Saved %s to %s", url, target_path)
+    return str(target_path)
+
+
+async def _save_images_to_disk_async(
     raw_images: list[dict[str, Any]],
     destination: Path,
     iteration_label: str,
+    client: httpx.AsyncClient,
 ) -> list[str]:
-    saved_paths: list[str] = []
     destination.mkdir(parents=True, exist_ok=True)
+    downloads: list[tuple[str, Path]] = []
     for idx, image in enumerate(raw_images, start=1):
         url = image.get("image_url")
         if not url:
             continue
         suffix = Path(urlparse(url).path).suffix or ".png"
-        file_name = f"{iteration_label}_{idx:02d}{suffix}"
-        target_path = destination / file_name
-        try:
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()
-            target_path.write_bytes(response.content)
-            saved_paths.append(str(target_path))
-            logger.debug("Saved %s to %s", url, target_path)
-        except Exception as exc:
-            logger.warning("Failed to save image %s: %s", url, exc)
-    return saved_paths
+        downloads.append((url, destination / f"{iteration_label}_{idx:02d}{suffix}"))
+    if not downloads:
+        return []
+
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_fetch_one(client, semaphore, url, path) for url, path in downloads)
+    )
+    return [path for path in results if path is not None]
 
 
 def _collect_asset_preferences_from_results(
@@ -181,17 +266,18 @@ def _collect_asset_preferences_from_results(
 ) -> dict[str, set[str]]:
     preferences: dict[str, set[str]] = defaultdict(set)
     for image in raw_images:
-        request_id = str(image.get("request_id"))
-        if request_id not in preferred_image_ids:
+        request_id = image.get("request_id")
+        if request_id is None or str(request_id) not in preferred_image_ids:
             continue
-        for asset_class, asset in image.get("assets", {}).items():
-            asset_id = asset.get("id")
+        for asset_class, asset in (image.get("assets") or {}).items():
+            asset_id = asset.get("id") if asset else None
             if asset_id:
                 preferences[asset_class].add(asset_id)
     return preferences
 
 
-def _normalize_class_name(name: str, available_classes: set[str]) -> str | None:
+@lru_cache(maxsize=512)
+def _normalize_class_name(name: str, available_classes: frozenset[str]) -> str | None:
     candidates = [name, name.lower()]
     if name.endswith("s"):
         candidates.append(name[:-1])
@@ -205,7 +291,7 @@ def _normalize_class_name(name: str, available_classes: set[str]) -> str | None:
 
 def _collect_asset_preferences_from_similar(
     similar_assets: Sequence[tuple[Any, float]],
-    available_classes: set[str],
+    available_classes: frozenset[str],
 ) -> dict[str, set[str]]:
     preferences: dict[str, set[str]] = defaultdict(set)
     for asset, _score in similar_assets:
@@ -222,82 +308,145 @@ def _collect_asset_preferences_from_similar(
 
 
 def _merge_preference_maps(
-    available_classes: set[str],
+    available_classes: frozenset[str],
     *maps: dict[str, set[str]],
 ) -> dict[str, set[str]]:
     merged: dict[str, set[str]] = defaultdict(set)
     for pref_map in maps:
         for cls, ids in pref_map.items():
+            # Skipping empty id sets here means no empty entry can reach the result
+            if not ids:
+                continue
             normalized = _normalize_class_name(cls, available_classes)
             if not normalized:
                 continue
-            merged[normalized].update(ids)
-    return {cls: ids for cls, ids in merged.items() if ids}
+            merged[normalized] |= ids
+    return dict(merged)
 
 
-def run_campaign(
+async def run_campaign_async(
     assets_dir: str,
     base_prompt: str,
     target_groups: Sequence[str],
+    *,
     images_per_group: int = DEFAULT_IMAGES_PER_GROUP,
     top_n: int = DEFAULT_TOP_N,
     search_top_k: int = DEFAULT_TOP_K,
     iterations: int = DEFAULT_ITERATIONS,
     output_dir: str | None = None,
+    run_id: str | None = None,
 ) -> dict[str, dict]:
-    session = FluxBatchSession(assets_dir)
-    available_classes = set(session.assets.keys())
-    campaign_results: dict[str, dict] = {}
-    run_output_root = _prepare_output_root(output_dir)
+    """
+    Run the campaign one iteration level at a time across all target groups.
+
+    Each level starts by generating images for every group. All images then go
+    through one analytics call. Every group's asset search is served by one
+    batched embedding request and one pass over the asset table. The per-group
+    difference analyses run concurrently with that search and with the image
+    downloads. Levels stay sequential, because a group's next generation needs
+    this level's prompt and asset preferences.
+
+    Output goes to `output_dir/<run_id>`; without a `run_id` the directory is
+    named after the UTC start time, so pass one to reuse a run directory.
+    """
+    # Fresh usage tracking per run, but the scanned asset catalog is shared across runs
+    session = FluxBatchSession(assets_dir, assets=_load_asset_catalog(assets_dir))
+    available_classes = frozenset(session.assets.keys())
+    run_output_root = _prepare_output_root(output_dir, run_id)
     logger.info("Saving generated assets under %s", run_output_root)
 
     total_iterations = max(1, iterations)
+    groups = list(target_groups)
+
+    group_dirs: dict[str, Path] = {}
+    for group in groups:
+        group_dirs[group] = run_output_root / _slugify(group)
+        group_dirs[group].mkdir(parents=True, exist_ok=True)
+        logger.info("Starting group '%s' (output=%s)", group, group_dirs[group])
+
+    preferred_assets: dict[str, dict[str, set[str]] | None] = dict.fromkeys(groups)
+    prompt_for_iteration: dict[str, str] = dict.fromkeys(groups, base_prompt)
+    iteration_records: dict[str, list[dict]] = {group: [] for group in groups}
+
+    async with _download_client() as http_client:
+        for iteration_idx in range(total_iterations):
+            iteration_label = f"iter_{iteration_idx + 1}"
+
+            logger.info(
+                "[%s] Generating %s images for each of %s groups",
+                iteration_label,
+                images_per_group,
+                len(groups),
+            )
+            # One batch per level: all groups' requests are submitted before any is polled
+            raw_images_by_group: dict[str, list[dict[str, Any]]] = await asyncio.to_thread(
+                session.generate_images_batched,
+                [(group, prompt_for_iteration[group], preferred_assets[group]) for group in groups],
+                num_images=images_per_group,
+            )
 
-    with _maybe_db_session() as db_session:
-        for group in target_groups:
-            group_slug = _slugify(group)
-            group_dir = run_output_root / group_slug
-            group_dir.mkdir(parents=True, exist_ok=True)
-            logger.info("Starting group '%s' (output=%s)", group, group_dir)
-
-            preferred_assets: dict[str, set[str]] | None = None
-            prompt_for_iteration = base_prompt
-            iteration_records: list[dict] = []
-
-            for iteration_idx in range(total_iterations):
-                iteration_label = f"iter_{iteration_idx + 1}"
-                logger.info(
-                    "[%s | %s] Generating %s images", group, iteration_label, images_per_group
-                )
-                raw_images = session.generate_images_for_group(
-                    base_prompt=prompt_for_iteration,
-                    target_group=group,
-                    num_images=images_per_group,
-                    preferred_asset_ids=preferred_assets,
-                )
+            save_tasks: dict[str, asyncio.Task[list[str]]] = {}
+            for group in groups:
+                raw_images = raw_images_by_group[group]
                 print_concise_summary({f"{group} ({iteration_label})": raw_images})
 
-                saved_files = _save_images_to_disk(
-                    raw_images,
-                    group_dir / iteration_label,
-                    iteration_label,
+                # Downloads only need the URLs; let them run while the images are evaluated
+                save_tasks[group] = asyncio.create_task(
+                    _save_images_to_disk_async(
+                        raw_images,
+                        group_dirs[group] / iteration_label,
+                        iteration_label,
+                        http_client,
+                    )
                 )
 
-                images = _results_to_images(group, raw_images)
-                enriched_images = _attach_analytics(images)
-
-                top_analytics = select_top_images(enriched_images, top_n=top_n)
-                top_ids = _get_top_ids(top_analytics)
-
-                analysis = analyze_image_differences(enriched_images, top_n=top_n)
+            # One analytics call for the whole level, scattered back per group
+            images_by_group = {
+                group: _results_to_images(group, raw_images)
+                for group, raw_images in raw_images_by_group.items()
+            }
+            all_enriched = iter(_attach_analytics([image for images in images_by_group.values() for image in images]))
+            enriched_by_group = {
+                group: [next(all_enriched) for _ in images] for group, images in images_by_group.items()
+            }
 
-                search_prompt = _build_asset_search_prompt(enriched_images, top_ids)
-                prompt_for_search = search_prompt or prompt_for_iteration
-                similar_assets = _search_assets_safe(
-                    db_session=db_session,
-                    prompt=prompt_for_search,
-                    top_k=search_top_k,
+            top_analytics_by_group = {
+                group: select_top_images(enriched, top_n=top_n)
+                for group, enriched in enriched_by_group.items()
+            }
+            top_ids_by_group = {
+                group: _get_top_ids(top_analytics) for group, top_analytics in top_analytics_by_group.items()
+            }
+            search_prompts = [
+                _build_asset_search_prompt(
+                    {image.id: image for image in enriched_by_group[group]},
+                    # Ranked order keeps the prompt deterministic, unlike iterating the id set
+                    [item.id for item in top_analytics_by_group[group]],
                 )
+                or prompt_for_iteration[group]
+                for group in groups
+            ]
+
+            analyses, similar_by_group, saved_by_group = await asyncio.gather(
+                asyncio.gather(
+                    *(
+                        asyncio.to_thread(analyze_image_differences, enriched_by_group[group], top_n=top_n)
+                        for group in groups
+                    )
+                ),
+                asyncio.to_thread(
+                    _search_assets_batch_safe,
+                    prompts=search_prompts,
+                    top_k=search_top_k,
+                ),
+                asyncio.gather(*(save_tasks[group] for group in groups)),
+            )
+
+            for group, analysis, similar_assets, saved_files in zip(
+                groups, analyses, similar_by_group, saved_by_group, strict=True
+            ):
+                raw_images = raw_images_by_group[group]
+                top_ids = top_ids_by_group[group]
 
                 preferences_from_results = _collect_asset_preferences_from_results(
                     raw_images,
@@ -307,7 +456,7 @@ def run_campaign(
                     similar_assets,
                     available_classes,
                 )
-                preferred_assets = _merge_preference_maps(
+                preferred_assets[group] = _merge_preference_maps(
                     available_classes,
                     preferences_from_results,
                     preferences_from_similar,
@@ -322,18 +471,18 @@ def run_campaign(
                 )
 
                 prefs_snapshot = (
-                    {cls: sorted(ids) for cls, ids in preferred_assets.items()}
-                    if preferred_assets
+                    {cls: sorted(ids) for cls, ids in preferred_assets[group].items()}
+                    if preferred_assets[group]
                     else None
                 )
 
-                iteration_records.append(
+                iteration_records[group].append(
                     {
                         "label": iteration_label,
-                        "prompt_used": prompt_for_iteration,
+                        "prompt_used": prompt_for_iteration[group],
                         "raw_images": raw_images,
-                        "images": enriched_images,
-                        "top_analytics": top_analytics,
+                        "images": enriched_by_group[group],
+                        "top_analytics": top_analytics_by_group[group],
                         "analysis": analysis,
                         "similar_assets": similar_assets,
                         "saved_files": saved_files,
@@ -351,21 +500,51 @@ def run_campaign(
                 )
 
                 if iteration_idx < total_iterations - 1:
-                    prompt_for_iteration = next_prompt
-
-            campaign_results[group] = {
-                "iterations": iteration_records,
-                "output_dir": str(group_dir),
-                "final_prompt": prompt_for_iteration,
-            }
-
+                    prompt_for_iteration[group] = next_prompt
+
+    campaign_results: dict[str, dict] = {
+        group: {
+            "iterations": iteration_records[group],
+            "output_dir": str(group_dirs[group]),
+            "final_prompt": prompt_for_iteration[group],
+        }
+        for group in groups
+    }
     campaign_results["_output_root"] = str(run_output_root)
     return campaign_results
 
 
+def run_campaign(
+    assets_dir: str,
+    base_prompt: str,
+    target_groups: Sequence[str],
+    *,
+    images_per_group: int = DEFAULT_IMAGES_PER_GROUP,
+    top_n: int = DEFAULT_TOP_N,
+    search_top_k: int = DEFAULT_TOP_K,
+    iterations: int = DEFAULT_ITERATIONS,
+    output_dir: str | None = None,
+    run_id: str | None = None,
+) -> dict[str, dict]:
+    """Synchronous entry point for `run_campaign_async`."""
+    return asyncio.run(
+        run_campaign_async(
+            assets_dir=assets_dir,
+            base_prompt=base_prompt,
+            target_groups=target_groups,
+            images_per_group=images_per_group,
+            top_n=top_n,
+            search_top_k=search_top_k,
+            iterations=iterations,
+            output_dir=output_dir,
+            run_id=run_id,
+        )
+    )
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run the campaign pipeline")
-    default_assets_dir = Path(__file__).resolve().parents[1] / "assets_folder"
+    default_assets_dir = _BACKEND_DIR / "assets_folder"
     parser.add_argument(
         "--assets-dir",
         default=str(default_assets_dir),
@@ -0,0 +1,80 @@
+"""
+cache.py
+
+In-process response cache for the campaign spec read endpoints.
+
+Campaign specs change rarely compared to how often they are read, so the
+serialized GET responses are kept for a short TTL. Every route that can change
+a spec response (the spec writes, and asset or target group updates and deletes)
+depends on `invalidate_spec_cache`, which clears the cache and bumps a version
+counter once the request's transaction commits; a read that started before the
+commit is then not stored, so it cannot resurrect stale data.
+
+The cache is per process. With several server workers, a write only clears the
+worker that served it, and the others may serve stale responses for up to the TTL.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlmodel import Session
+
+from database import get_session
+
+# Seconds a cached response stays valid; bounds staleness for writes made outside this process
+RESPONSE_CACHE_TTL = 30.0
+RESPONSE_CACHE_SIZE = 1024
+
+
+class ResponseCache:
+    """Thread-safe TTL cache with whole-cache invalidation."""
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_SIZE) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, object]] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute[T](self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached value for `key`, or compute and cache it. Exceptions are not cached."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]  # type: ignore[return-value]
+            version = self._version
+
+        value = compute()
+
+        with self._lock:
+            # Skip storing if a write invalidated the cache while we were computing
+            if version == self._version:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+
+# Cached campaign spec GET responses, shared by every router that can invalidate them
+spec_response_cache = ResponseCache()
+
+
+def invalidate_spec_cache(session: Session = Depends(get_session, scope='function')) -> None:
+    """
+    Route dependency clearing `spec_response_cache` whenever the request session commits.
+
+    Invalidating after the commit, rather than when the endpoint returns, keeps a
+    concurrent read from caching the pre-commit state. A rolled back request changed
+    nothing, so it leaves the cache alone.
+    """
+    event.listen(session, 'after_commit', lambda _session: spec_response_cache.invalidate())
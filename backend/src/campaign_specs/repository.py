@@ -1,11 +1,14 @@
 import logging
 from uuid import UUID
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.util import identity_key
 from sqlmodel import Session, select
 
 from models import (
-    Asset,
     CampaignSpec,
     CampaignSpecAsset,
     CampaignSpecTargetGroup,
@@ -20,17 +23,37 @@ class CampaignSpecRepository:
 
     def __init__(self, session: Session) -> None:
         self.session = session
-
-    def create(self, campaign_spec: CampaignSpec) -> CampaignSpec:
-        """Persist a new campaign spec to the database."""
+        # Specs fetched by get_by_id during this repository's (request's) lifetime;
+        # entries are dropped whenever the spec or its links change
+        self._spec_cache: dict[UUID, CampaignSpec] = {}
+
+    def create(
+        self,
+        campaign_spec: CampaignSpec,
+        target_group_ids: list[UUID] | None = None,
+        asset_ids: list[UUID] | None = None,
+    ) -> CampaignSpec:
+        """
+        Persist a new campaign spec, and optionally its links, in one transaction.
+
+        The relationships are loaded from the inserted links before the commit, so
+        the returned spec is complete without a separate get_by_id.
+        """
         self.session.add(campaign_spec)
-        self.session.commit()
-        self.session.refresh(campaign_spec)
+        self.session.flush()
+        self._insert_target_group_links(campaign_spec.id, target_group_ids or [])
+        self._insert_asset_links(campaign_spec.id, asset_ids or [])
+        self.session.refresh(campaign_spec, attribute_names=['target_groups', 'base_assets'])
+        self._commit_detached(campaign_spec)
         return campaign_spec
 
     def get_by_id(self, campaign_spec_id: UUID) -> CampaignSpec | None:
         """Get a campaign spec by its ID with relationships loaded."""
-        logger.info(f"Fetching campaign spec: {campaign_spec_id}")
+        cached = self._spec_cache.get(campaign_spec_id)
+        if cached is not None:
+            return cached
+
+        logger.debug("Fetching campaign spec: %s", campaign_spec_id)
         statement = (
             select(CampaignSpec)
             .where(CampaignSpec.id == campaign_spec_id)
@@ -42,23 +65,26 @@ class CampaignSpecRepository:
         spec = self.session.exec(statement).first()
 
         if spec:
-            logger.info(f"Found spec: {spec.id} ({spec.name})")
-            logger.info(f"  target_groups: {spec.target_groups}")
-            logger.info(f"  base_assets: {spec.base_assets}")
-
-            # Also check link table directly
-            link_statement = select(CampaignSpecTargetGroup).where(
-                CampaignSpecTargetGroup.campaign_spec_id == campaign_spec_id
+            logger.debug(
+                "Found spec %s (%s) with %s target groups and %s assets",
+                spec.id,
+                spec.name,
+                len(spec.target_groups),
+                len(spec.base_assets),
             )
-            links = list(self.session.exec(link_statement).all())
-            logger.info(f"  Direct link table query found {len(links)} links")
-            for link in links:
-                logger.info(f"    - link: spec={link.campaign_spec_id}, tg={link.target_group_id}")
+            self._spec_cache[campaign_spec_id] = spec
         else:
-            logger.warning(f"Campaign spec not found: {campaign_spec_id}")
+            logger.warning("Campaign spec not found: %s", campaign_spec_id)
 
         return spec
 
+    def exists(self, campaign_spec_id: UUID) -> bool:
+        """Check whether a campaign spec exists without loading it or its relationships."""
+        if campaign_spec_id in self._spec_cache:
+            return True
+        statement = select(1).where(CampaignSpec.id == campaign_spec_id).limit(1)
+        return self.session.exec(statement).first() is not None
+
     def get_all(self, skip: int = 0, limit: int = 100) -> list[CampaignSpec]:
         """Get all campaign specs with pagination."""
         statement = (
@@ -66,80 +92,158 @@ class CampaignSpecRepository:
             .options(
                 selectinload(CampaignSpec.target_groups),
                 selectinload(CampaignSpec.base_assets),
+                # Any other relationship access on a listed spec raises instead of lazy-loading per spec
+                raiseload('*'),
             )
             .offset(skip)
             .limit(limit)
         )
         return list(self.session.exec(statement).all())
 
-    def update(self, campaign_spec: CampaignSpec) -> CampaignSpec:
-        """Update an existing campaign spec."""
+    def update(
+        self,
+        campaign_spec: CampaignSpec,
+        target_group_ids: list[UUID] | None = None,
+        asset_ids: list[UUID] | None = None,
+    ) -> CampaignSpec:
+        """
+        Update an existing campaign spec in one transaction.
+
+        Link lists that are given replace the current links; the matching
+        relationships are reloaded before the commit.
+        """
+        self._spec_cache.pop(campaign_spec.id, None)
         self.session.add(campaign_spec)
-        self.session.commit()
-        self.session.refresh(campaign_spec)
+        self.session.flush()
+
+        reload: list[str] = []
+        if target_group_ids is not None:
+            self._delete_target_group_links(campaign_spec.id)
+            self._insert_target_group_links(campaign_spec.id, target_group_ids)
+            reload.append('target_groups')
+        if asset_ids is not None:
+            self._delete_asset_links(campaign_spec.id)
+            self._insert_asset_links(campaign_spec.id, asset_ids)
+            reload.append('base_assets')
+        if reload:
+            self.session.refresh(campaign_spec, attribute_names=reload)
+
+        self._commit_detached(campaign_spec)
         return campaign_spec
 
+    def _commit_detached(self, campaign_spec: CampaignSpec) -> None:
+        """
+        Detach the flushed spec and its loaded related rows, then commit.
+
+        All column defaults are generated in Python, so the in-memory objects already
+        match the rows; detaching keeps the commit from expiring them, which would
+        otherwise cost a refresh SELECT per object on next access.
+        """
+        state = inspect(campaign_spec)
+        for name in ('target_groups', 'base_assets'):
+            if name not in state.unloaded:
+                for related in getattr(campaign_spec, name):
+                    self.session.expunge(related)
+        self.session.expunge(campaign_spec)
+        self.session.commit()
+
     def delete(self, campaign_spec: CampaignSpec) -> None:
         """Delete a campaign spec from the database."""
+        self._spec_cache.pop(campaign_spec.id, None)
         self.session.delete(campaign_spec)
         self.session.commit()
 
     # Asset link management
-    def add_asset(self, campaign_spec_id: UUID, asset_id: UUID) -> None:
-        """Link an asset to a campaign spec."""
-        link = CampaignSpecAsset(campaign_spec_id=campaign_spec_id, asset_id=asset_id)
-        self.session.add(link)
+    def _insert_asset_links(self, campaign_spec_id: UUID, asset_ids: list[UUID]) -> None:
+        """Insert asset links with one multi-row INSERT, skipping ones that already exist. Does not commit."""
+        if not asset_ids:
+            return
+        rows = [{'campaign_spec_id': campaign_spec_id, 'asset_id': asset_id} for asset_id in asset_ids]
+        self.session.exec(insert(CampaignSpecAsset).on_conflict_do_nothing(), params=rows)
+
+    def replace_assets(self, campaign_spec_id: UUID, asset_ids: list[UUID]) -> None:
+        """Replace all asset links of a campaign spec with one DELETE, one multi-row INSERT and one commit."""
+        self._spec_cache.pop(campaign_spec_id, None)
+        self._delete_asset_links(campaign_spec_id)
+        self._insert_asset_links(campaign_spec_id, asset_ids)
         self.session.commit()
 
-    def remove_asset(self, campaign_spec_id: UUID, asset_id: UUID) -> bool:
-        """Remove an asset link from a campaign spec."""
-        statement = select(CampaignSpecAsset).where(
-            CampaignSpecAsset.campaign_spec_id == campaign_spec_id,
-            CampaignSpecAsset.asset_id == asset_id,
-        )
-        link = self.session.exec(statement).first()
-        if link:
-            self.session.delete(link)
-            self.session.commit()
-            return True
-        return False
+    def _delete_asset_links(self, campaign_spec_id: UUID) -> None:
+        """Delete every asset link of a campaign spec. Does not commit."""
+        self.session.exec(delete(CampaignSpecAsset).where(CampaignSpecAsset.campaign_spec_id == campaign_spec_id))
 
-    def get_assets(self, campaign_spec_id: UUID) -> list[Asset]:
-        """Get all assets linked to a campaign spec."""
-        statement = (
-            select(Asset)
-            .join(CampaignSpecAsset)
-            .where(CampaignSpecAsset.campaign_spec_id == campaign_spec_id)
-        )
-        return list(self.session.exec(statement).all())
+    def _loaded_relationship(self, campaign_spec_id: UUID, name: str) -> list | None:
+        """Return a spec relationship already loaded in this session, or None if it would need a query."""
+        spec = self.session.identity_map.get(identity_key(CampaignSpec, campaign_spec_id))
+        if spec is None or name in inspect(spec).unloaded:
+            return None
+        return list(getattr(spec, name))
 
     # Target group link management
-    def add_target_group(self, campaign_spec_id: UUID, target_group_id: UUID) -> None:
-        """Link a target group to a campaign spec."""
-        link = CampaignSpecTargetGroup(
-            campaign_spec_id=campaign_spec_id, target_group_id=target_group_id
-        )
-        self.session.add(link)
+    def add_target_group(self, campaign_spec_id: UUID, target_group_id: UUID) -> bool:
+        """
+        Link a target group to a campaign spec. Returns False if the spec does not exist.
+
+        The INSERT is attempted directly; the spec's existence is only checked if it fails.
+        """
+        try:
+            self.add_target_groups(campaign_spec_id, [target_group_id])
+        except IntegrityError:
+            self.session.rollback()
+            if self.exists(campaign_spec_id):
+                raise
+            return False
+        return True
+
+    def add_target_groups(self, campaign_spec_id: UUID, target_group_ids: list[UUID]) -> None:
+        """Link several target groups to a campaign spec with one multi-row INSERT and one commit."""
+        if not target_group_ids:
+            return
+        self._spec_cache.pop(campaign_spec_id, None)
+        self._insert_target_group_links(campaign_spec_id, target_group_ids)
         self.session.commit()
 
+    def _insert_target_group_links(self, campaign_spec_id: UUID, target_group_ids: list[UUID]) -> None:
+        """Insert target group links with one multi-row INSERT, skipping ones that already exist. Does not commit."""
+        if not target_group_ids:
+            return
+        rows = [
+            {'campaign_spec_id': campaign_spec_id, 'target_group_id': target_group_id}
+            for target_group_id in target_group_ids
+        ]
+        self.session.exec(insert(CampaignSpecTargetGroup).on_conflict_do_nothing(), params=rows)
+
     def remove_target_group(self, campaign_spec_id: UUID, target_group_id: UUID) -> bool:
-        """Remove a target group link from a campaign spec."""
-        statement = select(CampaignSpecTargetGroup).where(
-            CampaignSpecTargetGroup.campaign_spec_id == campaign_spec_id,
-            CampaignSpecTargetGroup.target_group_id == target_group_id,
+        """Remove a target group link from a campaign spec in one DELETE ... RETURNING round trip."""
+        statement = (
+            delete(CampaignSpecTargetGroup)
+            .where(
+                CampaignSpecTargetGroup.campaign_spec_id == campaign_spec_id,
+                CampaignSpecTargetGroup.target_group_id == target_group_id,
+            )
+            .returning(CampaignSpecTargetGroup.campaign_spec_id)
+        )
+        if self.session.exec(statement).first() is None:
+            return False
+        self._spec_cache.pop(campaign_spec_id, None)
+        self.session.commit()
+        return True
+
+    def _delete_target_group_links(self, campaign_spec_id: UUID) -> None:
+        """Delete every target group link of a campaign spec. Does not commit."""
+        self.session.exec(
+            delete(CampaignSpecTargetGroup).where(CampaignSpecTargetGroup.campaign_spec_id == campaign_spec_id)
         )
-        link = self.session.exec(statement).first()
-        if link:
-            self.session.delete(link)
-            self.session.commit()
-            return True
-        return False
 
     def get_target_groups(self, campaign_spec_id: UUID) -> list[TargetGroup]:
         """Get all target groups linked to a campaign spec."""
+        loaded = self._loaded_relationship(campaign_spec_id, 'target_groups')
+        if loaded is not None:
+            return loaded
         statement = (
             select(TargetGroup)
             .join(CampaignSpecTargetGroup)
             .where(CampaignSpecTargetGroup.campaign_spec_id == campaign_spec_id)
         )
         return list(self.session.exec(statement).all())
+
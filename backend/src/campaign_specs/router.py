@@ -1,12 +1,15 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlmodel import Session
 
+from campaign_specs.cache import invalidate_spec_cache, spec_response_cache
 from campaign_specs.repository import CampaignSpecRepository
 from campaign_specs.service import CampaignSpecNotFoundError, CampaignSpecService
 from database import get_session
 from models import (
+    CampaignSpecAssetIds,
     CampaignSpecCreate,
     CampaignSpecResponse,
     CampaignSpecUpdate,
@@ -15,14 +18,17 @@ from models import (
 
 router = APIRouter(prefix='/campaign-specs', tags=['campaign-specs'])
 
+# Built once at import; the list route serializes straight to JSON bytes with it
+spec_list_adapter = TypeAdapter(list[CampaignSpecResponse])
 
-def get_campaign_spec_service(session: Session = Depends(get_session)) -> CampaignSpecService:
+
+def get_campaign_spec_service(session: Session = Depends(get_session, scope='function')) -> CampaignSpecService:
     """Dependency injection for CampaignSpecService."""
     repository = CampaignSpecRepository(session)
     return CampaignSpecService(repository)
 
 
-@router.post('/', response_model=CampaignSpecResponse, status_code=201)
+@router.post('/', response_model=CampaignSpecResponse, status_code=201, dependencies=[Depends(invalidate_spec_cache)])
 def create_campaign_spec(
     data: CampaignSpecCreate,
     service: CampaignSpecService = Depends(get_campaign_spec_service),
@@ -37,10 +43,20 @@ def list_campaign_specs(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=1000),
     service: CampaignSpecService = Depends(get_campaign_spec_service),
-) -> list[CampaignSpecResponse]:
-    """Get all campaign specs with pagination."""
-    specs = service.list_campaign_specs(skip=skip, limit=limit)
-    return [CampaignSpecResponse.from_campaign_spec(s) for s in specs]
+) -> Response:
+    """
+    Get all campaign specs with pagination.
+
+    The JSON body is cached as bytes, so a cache hit skips FastAPI's response
+    validation and encoding entirely.
+    """
+    body = spec_response_cache.get_or_compute(
+        ('list', skip, limit),
+        lambda: spec_list_adapter.dump_json(
+            [CampaignSpecResponse.from_campaign_spec(s) for s in service.list_campaign_specs(skip=skip, limit=limit)]
+        ),
+    )
+    return Response(content=body, media_type='application/json')
 
 
 @router.get('/{campaign_spec_id}', response_model=CampaignSpecResponse)
@@ -50,13 +66,15 @@ def get_campaign_spec(
 ) -> CampaignSpecResponse:
     """Get a specific campaign spec by ID."""
     try:
-        spec = service.get_campaign_spec(campaign_spec_id)
-        return CampaignSpecResponse.from_campaign_spec(spec)
+        return spec_response_cache.get_or_compute(
+            ('spec', campaign_spec_id),
+            lambda: CampaignSpecResponse.from_campaign_spec(service.get_campaign_spec(campaign_spec_id)),
+        )
     except CampaignSpecNotFoundError:
         raise HTTPException(status_code=404, detail='Campaign spec not found')
 
 
-@router.patch('/{campaign_spec_id}', response_model=CampaignSpecResponse)
+@router.patch('/{campaign_spec_id}', response_model=CampaignSpecResponse, dependencies=[Depends(invalidate_spec_cache)])
 def update_campaign_spec(
     campaign_spec_id: UUID,
     data: CampaignSpecUpdate,
@@ -70,7 +88,7 @@ def update_campaign_spec(
         raise HTTPException(status_code=404, detail='Campaign spec not found')
 
 
-@router.delete('/{campaign_spec_id}', status_code=204)
+@router.delete('/{campaign_spec_id}', status_code=204, dependencies=[Depends(invalidate_spec_cache)])
 def delete_campaign_spec(
     campaign_spec_id: UUID,
     service: CampaignSpecService = Depends(get_campaign_spec_service),
@@ -82,6 +100,20 @@ def delete_campaign_spec(
         raise HTTPException(status_code=404, detail='Campaign spec not found')
 
 
+# Asset management endpoints
+@router.put('/{campaign_spec_id}/assets', status_code=204, dependencies=[Depends(invalidate_spec_cache)])
+def set_campaign_spec_assets(
+    campaign_spec_id: UUID,
+    data: CampaignSpecAssetIds,
+    service: CampaignSpecService = Depends(get_campaign_spec_service),
+) -> None:
+    """Replace all assets of a campaign spec in one request, instead of one call per asset."""
+    try:
+        service.set_assets(campaign_spec_id, data.asset_ids)
+    except CampaignSpecNotFoundError:
+        raise HTTPException(status_code=404, detail='Campaign spec not found')
+
+
 # Target group management endpoints
 @router.get('/{campaign_spec_id}/target-groups', response_model=list[TargetGroup])
 def get_campaign_spec_target_groups(
@@ -95,7 +127,7 @@ def get_campaign_spec_target_groups(
         raise HTTPException(status_code=404, detail='Campaign spec not found')
 
 
-@router.post('/{campaign_spec_id}/target-groups/{target_group_id}', status_code=201)
+@router.post('/{campaign_spec_id}/target-groups/{target_group_id}', status_code=201, dependencies=[Depends(invalidate_spec_cache)])
 def add_target_group_to_campaign_spec(
     campaign_spec_id: UUID,
     target_group_id: UUID,
@@ -109,7 +141,7 @@ def add_target_group_to_campaign_spec(
         raise HTTPException(status_code=404, detail='Campaign spec not found')
 
 
-@router.delete('/{campaign_spec_id}/target-groups/{target_group_id}', status_code=204)
+@router.delete('/{campaign_spec_id}/target-groups/{target_group_id}', status_code=204, dependencies=[Depends(invalidate_spec_cache)])
 def remove_target_group_from_campaign_spec(
     campaign_spec_id: UUID,
     target_group_id: UUID,
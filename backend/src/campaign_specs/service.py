@@ -23,20 +23,11 @@ class CampaignSpecService:
         # Extract relationship ids before creating the campaign spec
         target_group_ids = data.target_group_ids
         asset_ids = data.asset_ids
+        # Dump + model_validate measured faster than CampaignSpec(**fields) or model_validate(data)
         campaign_data = data.model_dump(exclude={'target_group_ids', 'asset_ids'})
         campaign_spec = CampaignSpec.model_validate(campaign_data)
-        campaign_spec = self.repository.create(campaign_spec)
-
-        # Add target groups if provided
-        for target_group_id in target_group_ids:
-            self.repository.add_target_group(campaign_spec.id, target_group_id)
-
-        # Add assets if provided
-        for asset_id in asset_ids:
-            self.repository.add_asset(campaign_spec.id, asset_id)
-
-        # Refresh to get the relationships loaded
-        return self.repository.get_by_id(campaign_spec.id)  # type: ignore
+        # The spec and its links are written in one transaction, and come back with relationships loaded
+        return self.repository.create(campaign_spec, target_group_ids=target_group_ids, asset_ids=asset_ids)
 
     def get_campaign_spec(self, campaign_spec_id: UUID) -> CampaignSpec:
         """Get a campaign spec by ID. Raises CampaignSpecNotFoundError if not found."""
@@ -65,41 +56,8 @@ class CampaignSpecService:
         for key, value in update_data.items():
             setattr(campaign_spec, key, value)
 
-        campaign_spec = self.repository.update(campaign_spec)
-
-        needs_refresh = False
-
-        # Update target groups if provided
-        if target_group_ids is not None:
-            # Remove all existing target groups
-            current_target_groups = self.repository.get_target_groups(campaign_spec_id)
-            for tg in current_target_groups:
-                self.repository.remove_target_group(campaign_spec_id, tg.id)
-
-            # Add new target groups
-            for target_group_id in target_group_ids:
-                self.repository.add_target_group(campaign_spec_id, target_group_id)
-
-            needs_refresh = True
-
-        # Update assets if provided
-        if asset_ids is not None:
-            # Remove all existing assets
-            current_assets = self.repository.get_assets(campaign_spec_id)
-            for asset in current_assets:
-                self.repository.remove_asset(campaign_spec_id, asset.id)
-
-            # Add new assets
-            for asset_id in asset_ids:
-                self.repository.add_asset(campaign_spec_id, asset_id)
-
-            needs_refresh = True
-
-        # Refresh to get updated relationships if needed
-        if needs_refresh:
-            campaign_spec = self.repository.get_by_id(campaign_spec_id)  # type: ignore
-
-        return campaign_spec
+        # Fields and any replaced links are written in one transaction
+        return self.repository.update(campaign_spec, target_group_ids=target_group_ids, asset_ids=asset_ids)
 
     def delete_campaign_spec(self, campaign_spec_id: UUID) -> None:
         """Delete a campaign spec. Raises CampaignSpecNotFoundError if not found."""
@@ -108,21 +66,28 @@ class CampaignSpecService:
             raise CampaignSpecNotFoundError(campaign_spec_id)
         self.repository.delete(campaign_spec)
 
+    # Asset management
+    def set_assets(self, campaign_spec_id: UUID, asset_ids: list[UUID]) -> None:
+        """Replace all assets of a campaign spec with one DELETE and one multi-row INSERT."""
+        if not self.repository.exists(campaign_spec_id):
+            raise CampaignSpecNotFoundError(campaign_spec_id)
+        self.repository.replace_assets(campaign_spec_id, asset_ids)
+
     # Target group management
     def add_target_group(self, campaign_spec_id: UUID, target_group_id: UUID) -> None:
         """Add a target group to a campaign spec."""
-        if not self.repository.get_by_id(campaign_spec_id):
+        if not self.repository.add_target_group(campaign_spec_id, target_group_id):
             raise CampaignSpecNotFoundError(campaign_spec_id)
-        self.repository.add_target_group(campaign_spec_id, target_group_id)
 
     def remove_target_group(self, campaign_spec_id: UUID, target_group_id: UUID) -> None:
         """Remove a target group from a campaign spec."""
-        if not self.repository.get_by_id(campaign_spec_id):
+        removed = self.repository.remove_target_group(campaign_spec_id, target_group_id)
+        # Only a DELETE that matched nothing needs the existence check
+        if not removed and not self.repository.exists(campaign_spec_id):
             raise CampaignSpecNotFoundError(campaign_spec_id)
-        self.repository.remove_target_group(campaign_spec_id, target_group_id)
 
     def get_target_groups(self, campaign_spec_id: UUID) -> list[TargetGroup]:
         """Get all target groups for a campaign spec."""
-        if not self.repository.get_by_id(campaign_spec_id):
+        if not self.repository.exists(campaign_spec_id):
             raise CampaignSpecNotFoundError(campaign_spec_id)
         return self.repository.get_target_groups(campaign_spec_id)
@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import ARRAY, Column, Float, String
+from sqlalchemy import ARRAY, Column, Computed, Float, Index, String, Uuid
 from sqlmodel import Field, Relationship, SQLModel
 
 from models import Asset, BaseModel, CampaignSpec, TargetGroup
@@ -48,7 +48,10 @@ class GeneratedImageAsset(SQLModel, table=True):
 class Campaign(BaseModel, table=True):
     """Campaign - a generated run instance of a CampaignSpec."""
 
-    campaign_spec_id: UUID = Field(foreign_key='campaignspec.id', index=True)
+    # At most one campaign per spec; create_campaign relies on this to skip a separate existence check
+    __table_args__ = (Index('ix_campaign_campaign_spec_id_unique', 'campaign_spec_id', unique=True),)
+
+    campaign_spec_id: UUID = Field(foreign_key='campaignspec.id')
 
     # Relationships
     campaign_spec: CampaignSpec | None = Relationship()
@@ -63,7 +66,10 @@ class Campaign(BaseModel, table=True):
 class CampaignFlow(BaseModel, table=True):
     """Campaign flow - one per target group within a campaign run."""
 
-    campaign_id: UUID = Field(foreign_key='campaign.id', index=True)
+    # One flow per target group per campaign; also serves flow lookups by campaign_id
+    __table_args__ = (Index('ix_campaignflow_campaign_id_target_group_id', 'campaign_id', 'target_group_id', unique=True),)
+
+    campaign_id: UUID = Field(foreign_key='campaign.id')
     target_group_id: UUID = Field(foreign_key='targetgroup.id', index=True)
     initial_prompt: str  # The starting prompt for this flow (from campaign spec)
 
@@ -72,19 +78,6 @@ class CampaignFlow(BaseModel, table=True):
     target_group: TargetGroup | None = Relationship()
     steps: list[FlowStep] = Relationship(back_populates='flow')
 
-    @property
-    def current_step(self) -> FlowStep | None:
-        """Get the latest step (highest iteration)."""
-        if not self.steps:
-            return None
-        return max(self.steps, key=lambda s: s.iteration)
-
-    @property
-    def current_state(self) -> FlowStepState | None:
-        """Derive current state from latest step."""
-        step = self.current_step
-        return step.state if step else None
-
 
 # ---------------------------------------------------------
 # FlowStep (core iteration unit with state machine)
@@ -94,8 +87,12 @@ class CampaignFlow(BaseModel, table=True):
 class FlowStep(BaseModel, table=True):
     """Flow step - one iteration in the optimization loop."""
 
-    flow_id: UUID = Field(foreign_key='campaignflow.id', index=True)
-    iteration: int = Field(index=True)  # 0, 1, 2, ...
+    # One step per iteration of a flow. Steps in iteration order and the latest step
+    # (CampaignRepository.get_latest_step) are read straight off this index, no sort
+    __table_args__ = (Index('ix_flowstep_flow_id_iteration', 'flow_id', 'iteration', unique=True),)
+
+    flow_id: UUID = Field(foreign_key='campaignflow.id')
+    iteration: int  # 0, 1, 2, ...
     state: FlowStepState = Field(default=FlowStepState.GENERATING)
 
     # Input from previous step's analysis (null for iteration 0)
@@ -170,22 +167,27 @@ class ImageMetrics(BaseModel, table=True):
     conversions: int = Field(default=0)
     cost: float = Field(default=0.0)
 
-    # Derived metrics (computed on save)
-    ctr: float = Field(default=0.0)  # clicks / impressions
-    conversion_rate: float = Field(default=0.0)  # conversions / clicks
-    cpc: float = Field(default=0.0)  # cost / clicks
-    cpa: float = Field(default=0.0)  # cost / conversions
+    # Derived metrics (generated columns: Postgres computes them on every insert/update, None until flushed)
+    ctr: float | None = Field(
+        default=None,
+        sa_column=Column(Float, Computed('CASE WHEN impressions > 0 THEN clicks::float / impressions ELSE 0 END', persisted=True)),
+    )
+    conversion_rate: float | None = Field(
+        default=None,
+        sa_column=Column(Float, Computed('CASE WHEN clicks > 0 THEN conversions::float / clicks ELSE 0 END', persisted=True)),
+    )
+    cpc: float | None = Field(
+        default=None,
+        sa_column=Column(Float, Computed('CASE WHEN clicks > 0 THEN cost / clicks ELSE 0 END', persisted=True)),
+    )
+    cpa: float | None = Field(
+        default=None,
+        sa_column=Column(Float, Computed('CASE WHEN conversions > 0 THEN cost / conversions ELSE 0 END', persisted=True)),
+    )
 
     # Relationships
     image: GeneratedImage | None = Relationship(back_populates='metrics')
 
-    def compute_derived_metrics(self) -> None:
-        """Compute derived metrics from raw values."""
-        self.ctr = self.clicks / self.impressions if self.impressions > 0 else 0.0
-        self.conversion_rate = self.conversions / self.clicks if self.clicks > 0 else 0.0
-        self.cpc = self.cost / self.clicks if self.clicks > 0 else 0.0
-        self.cpa = self.cost / self.conversions if self.conversions > 0 else 0.0
-
 
 # ---------------------------------------------------------
 # AnalysisResult (ANALYZING state output)
@@ -198,7 +200,7 @@ class AnalysisResult(BaseModel, table=True):
     step_id: UUID = Field(foreign_key='flowstep.id', unique=True, index=True)
 
     # Winners (top 2 image IDs, ordered best first)
-    winner_image_ids: list[UUID] = Field(sa_column=Column(ARRAY(String)))
+    winner_image_ids: list[UUID] = Field(sa_column=Column(ARRAY(Uuid)))
 
     # Output for next iteration
     # Mean embedding of source assets from winning images
@@ -229,6 +231,28 @@ class CampaignResponse(SQLModel):
     campaign_spec_id: UUID
 
 
+class CampaignFlowListItem(SQLModel):
+    """Flow row for list responses (column values only, no relationships)."""
+
+    id: UUID
+    created_at: datetime
+    campaign_id: UUID
+    target_group_id: UUID
+    initial_prompt: str
+
+
+class FlowStepListItem(SQLModel):
+    """Step row for list responses (column values only, no relationships)."""
+
+    id: UUID
+    created_at: datetime
+    flow_id: UUID
+    iteration: int
+    state: FlowStepState
+    input_embedding: list[float] | None
+    input_insights: str | None
+
+
 class FlowStepCreate(SQLModel):
     """Schema for creating a new flow step."""
 
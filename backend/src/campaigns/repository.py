@@ -1,47 +1,139 @@
+from collections import defaultdict
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, bindparam, exists, func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import defer, raiseload, selectinload
 from sqlmodel import Session, select
+from sqlmodel.sql.expression import SelectOfScalar
 
 from campaigns.models import (
     AnalysisResult,
     Campaign,
     CampaignFlow,
     FlowStep,
+    FlowStepState,
     GeneratedImage,
     GeneratedImageAsset,
     GenerationResult,
     GenerationResultAsset,
     ImageMetrics,
 )
+from database import skipped_unique_indexes
+from models import Asset
+
+# Unique index on Campaign.campaign_spec_id that enforces one campaign per spec
+CAMPAIGN_SPEC_UNIQUE_INDEX = 'ix_campaign_campaign_spec_id_unique'
+
+# Column rows of the list_flow_rows / list_step_rows queries, in select order
+FlowRow = Row[tuple[UUID, datetime, UUID, UUID, str]]
+StepRow = Row[tuple[UUID, datetime, UUID, int, FlowStepState, list[float] | None, str | None]]
+
+
+def _campaign_full_statement() -> SelectOfScalar[Campaign]:
+    """
+    Build the get_campaign_full query.
+
+    Each level is loaded with one SELECT ... IN query through shared option
+    prefixes; any relationship outside the tree raises instead of lazy-loading.
+    Step, analysis and asset embeddings are deferred: the full-campaign
+    response does not include them, and each is a 1536-float array per row.
+    """
+    flows = selectinload(Campaign.campaign_flows)
+    steps = flows.selectinload(CampaignFlow.steps)
+    generation = steps.selectinload(FlowStep.generation_result)
+    images = generation.selectinload(GenerationResult.generated_images)
+    return (
+        select(Campaign)
+        .where(Campaign.id == bindparam('campaign_id'))
+        .options(
+            selectinload(Campaign.campaign_spec).raiseload('*'),
+            flows.selectinload(CampaignFlow.target_group).raiseload('*'),
+            steps.defer(FlowStep.input_embedding),
+            generation.selectinload(GenerationResult.selected_assets).options(
+                defer(Asset.embedding), raiseload('*')
+            ),
+            images.selectinload(GeneratedImage.source_assets).options(defer(Asset.embedding), raiseload('*')),
+            images.selectinload(GeneratedImage.metrics).raiseload('*'),
+            steps.selectinload(FlowStep.analysis_result).options(
+                defer(AnalysisResult.output_embedding), raiseload('*')
+            ),
+            raiseload('*'),
+        )
+    )
+
+
+# Fixed-shape statements are built once at import and executed with bound values,
+# instead of rebuilding the statement (and its loader options) on every call
+CAMPAIGN_FULL_STATEMENT = _campaign_full_statement()
+STEPS_BY_FLOW_STATEMENT = select(FlowStep).where(FlowStep.flow_id == bindparam('flow_id')).order_by(FlowStep.iteration)
+LATEST_STEP_STATEMENT = (
+    select(FlowStep).where(FlowStep.flow_id == bindparam('flow_id')).order_by(FlowStep.iteration.desc()).limit(1)
+)
+GENERATION_RESULT_BY_STEP_STATEMENT = select(GenerationResult).where(GenerationResult.step_id == bindparam('step_id'))
+IMAGES_BY_GENERATION_RESULT_STATEMENT = select(GeneratedImage).where(
+    GeneratedImage.generation_result_id == bindparam('result_id')
+)
+IMAGES_BY_STEP_STATEMENT = (
+    select(GeneratedImage).join(GenerationResult).where(GenerationResult.step_id == bindparam('step_id'))
+)
 
 
 class CampaignRepository:
-    """Data access layer for Campaign entities."""
+    """
+    Data access layer for Campaign entities.
+
+    Writes only flush; committing is left to whoever owns the session
+    (get_session per request, FlowOrchestrator per job).
+    """
 
     def __init__(self, session: Session) -> None:
         self.session = session
+        # Flows fetched by get_flow during this repository's (request's) lifetime. Campaigns and
+        # steps are looked up with session.get, which the session's identity map already serves.
+        self._flow_cache: dict[UUID, CampaignFlow] = {}
 
     # ---------------------------------------------------------
     # Campaign
     # ---------------------------------------------------------
 
-    def create_campaign(self, campaign: Campaign) -> Campaign:
-        """Create a new campaign."""
-        self.session.add(campaign)
-        self.session.commit()
-        self.session.refresh(campaign)
-        return campaign
+    def create_campaign(self, campaign_spec_id: UUID) -> Campaign | None:
+        """
+        Create a campaign for a spec in one INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+        Returns None if the spec already has a campaign. The unique index decides, so
+        concurrent creates for the same spec cannot both succeed. The conflict target is
+        left implicit so the insert still works on a database where ensure_indexes could
+        not create that index because of existing duplicates; there, an existence check
+        runs first instead, as before the index was added.
+        """
+        if CAMPAIGN_SPEC_UNIQUE_INDEX in skipped_unique_indexes:
+            exists_statement = select(1).where(Campaign.campaign_spec_id == campaign_spec_id).limit(1)
+            if self.session.exec(exists_statement).first() is not None:
+                return None
+        statement = insert(Campaign).values(campaign_spec_id=campaign_spec_id).on_conflict_do_nothing().returning(Campaign)
+        return self.session.exec(statement).scalar_one_or_none()
 
     def get_campaign(self, campaign_id: UUID) -> Campaign | None:
         """Get a campaign by ID."""
         return self.session.get(Campaign, campaign_id)
 
+    def campaign_exists(self, campaign_id: UUID) -> bool:
+        """Check whether a campaign exists without loading it."""
+        statement = select(1).where(Campaign.id == campaign_id).limit(1)
+        return self.session.exec(statement).first() is not None
+
     def get_campaigns(self, skip: int = 0, limit: int = 100) -> list[Campaign]:
         """Get all campaigns with pagination."""
         statement = select(Campaign).offset(skip).limit(limit)
         return list(self.session.exec(statement).all())
 
+    def list_campaign_rows(self, skip: int = 0, limit: int = 100) -> list[tuple[UUID, datetime, UUID]]:
+        """Get (id, created_at, campaign_spec_id) rows with pagination, without building Campaign instances."""
+        statement = select(Campaign.id, Campaign.created_at, Campaign.campaign_spec_id).offset(skip).limit(limit)
+        return list(self.session.exec(statement).all())
+
     def get_campaigns_by_spec(self, campaign_spec_id: UUID) -> list[Campaign]:
         """Get all campaigns for a spec."""
         statement = select(Campaign).where(Campaign.campaign_spec_id == campaign_spec_id)
@@ -54,12 +146,32 @@ class CampaignRepository:
     def create_flow(self, flow: CampaignFlow) -> CampaignFlow:
         """Create a new campaign flow."""
         self.session.add(flow)
-        self.session.commit()
-        self.session.refresh(flow)
+        self.session.flush()
         return flow
 
+    def create_flows_many(self, flows: list[CampaignFlow]) -> list[CampaignFlow]:
+        """Create several campaign flows with one batched INSERT."""
+        self.session.add_all(flows)
+        self.session.flush()
+        return flows
+
     def get_flow(self, flow_id: UUID) -> CampaignFlow | None:
         """Get a flow by ID with campaign relationship loaded."""
+        flow = self._flow_cache.get(flow_id)
+        if flow is None:
+            flow = self._fetch_flow(flow_id)
+        return flow
+
+    def get_flow_scoped(self, flow_id: UUID, campaign_id: UUID) -> CampaignFlow | None:
+        """Get a flow only if it belongs to `campaign_id`, checked in the query; relationships are not loaded."""
+        flow = self._flow_cache.get(flow_id)
+        if flow is not None:
+            return flow if flow.campaign_id == campaign_id else None
+        statement = select(CampaignFlow).where(CampaignFlow.id == flow_id, CampaignFlow.campaign_id == campaign_id)
+        return self.session.exec(statement).first()
+
+    def _fetch_flow(self, flow_id: UUID) -> CampaignFlow | None:
+        """Load a flow with its campaign and target group, and remember it for later get_flow calls."""
         statement = (
             select(CampaignFlow)
             .where(CampaignFlow.id == flow_id)
@@ -68,7 +180,15 @@ class CampaignRepository:
                 selectinload(CampaignFlow.target_group),
             )
         )
-        return self.session.exec(statement).first()
+        flow = self.session.exec(statement).first()
+        if flow is not None:
+            self._flow_cache[flow_id] = flow
+        return flow
+
+    def flow_exists(self, flow_id: UUID, campaign_id: UUID) -> bool:
+        """Check whether a flow exists in a campaign without loading it."""
+        statement = select(1).where(CampaignFlow.id == flow_id, CampaignFlow.campaign_id == campaign_id).limit(1)
+        return self.session.exec(statement).first() is not None
 
     def get_flows_by_campaign(self, campaign_id: UUID) -> list[CampaignFlow]:
         """Get all flows for a campaign with relationships loaded."""
@@ -80,49 +200,125 @@ class CampaignRepository:
                 selectinload(CampaignFlow.target_group),
             )
         )
+        flows = list(self.session.exec(statement).all())
+        # Loaded with the same relationships as get_flow, so later get_flow calls can reuse them
+        self._flow_cache.update((flow.id, flow) for flow in flows)
+        return flows
+
+    def list_flow_rows(self, campaign_id: UUID) -> list[FlowRow]:
+        """Get (id, created_at, campaign_id, target_group_id, initial_prompt) rows for a campaign's flows."""
+        statement = select(
+            CampaignFlow.id,
+            CampaignFlow.created_at,
+            CampaignFlow.campaign_id,
+            CampaignFlow.target_group_id,
+            CampaignFlow.initial_prompt,
+        ).where(CampaignFlow.campaign_id == campaign_id)
         return list(self.session.exec(statement).all())
 
     # ---------------------------------------------------------
     # FlowStep
     # ---------------------------------------------------------
 
-    def create_step(self, step: FlowStep) -> FlowStep:
-        """Create a new flow step."""
-        self.session.add(step)
-        self.session.commit()
-        self.session.refresh(step)
-        return step
+    def create_next_step(
+        self,
+        flow_id: UUID,
+        input_embedding: list[float] | None = None,
+        input_insights: str | None = None,
+    ) -> FlowStep:
+        """
+        Create the flow's next step in a single INSERT ... RETURNING.
+
+        The iteration is computed in the same statement (latest iteration + 1, or 0 for the
+        first step), so no separate read is needed. Two concurrent callers would compute the
+        same iteration; the unique (flow_id, iteration) index makes the second one fail.
+        """
+        next_iteration = (
+            select(func.coalesce(func.max(FlowStep.iteration) + 1, 0)).where(FlowStep.flow_id == flow_id).scalar_subquery()
+        )
+        statement = (
+            insert(FlowStep)
+            .values(
+                flow_id=flow_id,
+                iteration=next_iteration,
+                state=FlowStepState.GENERATING,
+                input_embedding=input_embedding,
+                input_insights=input_insights,
+            )
+            .returning(FlowStep)
+        )
+        return self.session.exec(statement).scalar_one()
 
     def get_step(self, step_id: UUID) -> FlowStep | None:
         """Get a step by ID."""
         return self.session.get(FlowStep, step_id)
 
+    def get_step_scoped(self, step_id: UUID, flow_id: UUID, campaign_id: UUID | None = None) -> FlowStep | None:
+        """Get a step only if it belongs to `flow_id` (and, with `campaign_id`, the flow to that campaign), checked in one query."""
+        statement = select(FlowStep).where(FlowStep.id == step_id, FlowStep.flow_id == flow_id)
+        if campaign_id is not None:
+            statement = statement.join(CampaignFlow).where(CampaignFlow.campaign_id == campaign_id)
+        return self.session.exec(statement).first()
+
     def get_steps_by_flow(self, flow_id: UUID) -> list[FlowStep]:
         """Get all steps for a flow, ordered by iteration."""
+        return list(self.session.exec(STEPS_BY_FLOW_STATEMENT, params={'flow_id': flow_id}).all())
+
+    def list_step_rows(self, flow_id: UUID, campaign_id: UUID | None = None) -> list[StepRow]:
+        """Get a flow's step column rows ordered by iteration; with `campaign_id`, only if the flow belongs to it."""
         statement = (
-            select(FlowStep)
+            select(
+                FlowStep.id,
+                FlowStep.created_at,
+                FlowStep.flow_id,
+                FlowStep.iteration,
+                FlowStep.state,
+                FlowStep.input_embedding,
+                FlowStep.input_insights,
+            )
             .where(FlowStep.flow_id == flow_id)
             .order_by(FlowStep.iteration)
         )
+        if campaign_id is not None:
+            statement = statement.join(CampaignFlow).where(CampaignFlow.campaign_id == campaign_id)
         return list(self.session.exec(statement).all())
 
-    def get_latest_step(self, flow_id: UUID) -> FlowStep | None:
-        """Get the latest step for a flow."""
-        statement = (
-            select(FlowStep)
-            .where(FlowStep.flow_id == flow_id)
-            .order_by(FlowStep.iteration.desc())
-            .limit(1)
-        )
-        return self.session.exec(statement).first()
+    def get_latest_step(self, flow_id: UUID, campaign_id: UUID | None = None) -> FlowStep | None:
+        """Get the latest step for a flow; with `campaign_id`, only if the flow belongs to it."""
+        statement = LATEST_STEP_STATEMENT
+        if campaign_id is not None:
+            statement = statement.join(CampaignFlow).where(CampaignFlow.campaign_id == campaign_id)
+        return self.session.exec(statement, params={'flow_id': flow_id}).first()
 
     def update_step(self, step: FlowStep) -> FlowStep:
         """Update a step."""
         self.session.add(step)
-        self.session.commit()
-        self.session.refresh(step)
+        self.session.flush()
         return step
 
+    def transition_step(
+        self,
+        step_id: UUID,
+        from_state: FlowStepState,
+        to_state: FlowStepState,
+        required_result: type[GenerationResult] | type[AnalysisResult] | None = None,
+    ) -> FlowStep | None:
+        """
+        Move a step from `from_state` to `to_state` in one guarded UPDATE ... RETURNING.
+
+        With `required_result`, the step must also have a row of that model. Returns None
+        if any condition fails; the guard is evaluated atomically with the write.
+        """
+        statement = (
+            update(FlowStep)
+            .where(FlowStep.id == step_id, FlowStep.state == from_state)
+            .values(state=to_state)
+            .returning(FlowStep)
+        )
+        if required_result is not None:
+            statement = statement.where(exists().where(required_result.step_id == step_id))
+        return self.session.exec(statement).scalar_one_or_none()
+
     # ---------------------------------------------------------
     # GenerationResult
     # ---------------------------------------------------------
@@ -130,8 +326,7 @@ class CampaignRepository:
     def create_generation_result(self, result: GenerationResult) -> GenerationResult:
         """Create a generation result."""
         self.session.add(result)
-        self.session.commit()
-        self.session.refresh(result)
+        self.session.flush()
         return result
 
     def get_generation_result(self, result_id: UUID) -> GenerationResult | None:
@@ -140,8 +335,12 @@ class CampaignRepository:
 
     def get_generation_result_by_step(self, step_id: UUID) -> GenerationResult | None:
         """Get the generation result for a step."""
-        statement = select(GenerationResult).where(GenerationResult.step_id == step_id)
-        return self.session.exec(statement).first()
+        return self.session.exec(GENERATION_RESULT_BY_STEP_STATEMENT, params={'step_id': step_id}).first()
+
+    def get_generation_results_by_step_ids(self, step_ids: list[UUID]) -> dict[UUID, GenerationResult]:
+        """Get the generation results of several steps in one query, keyed by step id (steps without one are absent)."""
+        statement = select(GenerationResult).where(GenerationResult.step_id.in_(step_ids))
+        return {result.step_id: result for result in self.session.exec(statement)}
 
     def delete_generation_result(self, result_id: UUID) -> None:
         """Delete a generation result and all associated images/metrics."""
@@ -175,9 +374,14 @@ class CampaignRepository:
 
     def add_generation_result_asset(self, result_id: UUID, asset_id: UUID) -> None:
         """Link an asset to a generation result."""
-        link = GenerationResultAsset(generation_result_id=result_id, asset_id=asset_id)
-        self.session.add(link)
-        self.session.commit()
+        self.add_generation_result_assets(result_id, [asset_id])
+
+    def add_generation_result_assets(self, result_id: UUID, asset_ids: list[UUID]) -> None:
+        """Link several assets to a generation result with one multi-row INSERT, skipping existing links."""
+        if not asset_ids:
+            return
+        rows = [{'generation_result_id': result_id, 'asset_id': asset_id} for asset_id in asset_ids]
+        self.session.exec(insert(GenerationResultAsset).on_conflict_do_nothing(), params=rows)
 
     # ---------------------------------------------------------
     # GeneratedImage
@@ -186,8 +390,7 @@ class CampaignRepository:
     def create_generated_image(self, image: GeneratedImage) -> GeneratedImage:
         """Create a generated image."""
         self.session.add(image)
-        self.session.commit()
-        self.session.refresh(image)
+        self.session.flush()
         return image
 
     def get_generated_image(self, image_id: UUID) -> GeneratedImage | None:
@@ -196,16 +399,30 @@ class CampaignRepository:
 
     def get_images_by_generation_result(self, result_id: UUID) -> list[GeneratedImage]:
         """Get all images for a generation result."""
-        statement = select(GeneratedImage).where(
-            GeneratedImage.generation_result_id == result_id
-        )
-        return list(self.session.exec(statement).all())
+        return list(self.session.exec(IMAGES_BY_GENERATION_RESULT_STATEMENT, params={'result_id': result_id}).all())
+
+    def get_images_by_step(self, step_id: UUID) -> list[GeneratedImage]:
+        """Get all images generated for a step, joining through its generation result in one query."""
+        return list(self.session.exec(IMAGES_BY_STEP_STATEMENT, params={'step_id': step_id}).all())
+
+    def get_images_by_generation_results(self, result_ids: list[UUID]) -> dict[UUID, list[GeneratedImage]]:
+        """Get the images of several generation results in one query, keyed by generation result id."""
+        statement = select(GeneratedImage).where(GeneratedImage.generation_result_id.in_(result_ids))
+        images_by_result: dict[UUID, list[GeneratedImage]] = defaultdict(list)
+        for image in self.session.exec(statement):
+            images_by_result[image.generation_result_id].append(image)
+        return {result_id: images_by_result[result_id] for result_id in result_ids}
 
     def add_generated_image_asset(self, image_id: UUID, asset_id: UUID) -> None:
         """Link a source asset to a generated image."""
-        link = GeneratedImageAsset(generated_image_id=image_id, asset_id=asset_id)
-        self.session.add(link)
-        self.session.commit()
+        self.add_generated_image_assets(image_id, [asset_id])
+
+    def add_generated_image_assets(self, image_id: UUID, asset_ids: list[UUID]) -> None:
+        """Link several source assets to a generated image with one multi-row INSERT, skipping existing links."""
+        if not asset_ids:
+            return
+        rows = [{'generated_image_id': image_id, 'asset_id': asset_id} for asset_id in asset_ids]
+        self.session.exec(insert(GeneratedImageAsset).on_conflict_do_nothing(), params=rows)
 
     # ---------------------------------------------------------
     # ImageMetrics
@@ -213,10 +430,14 @@ class CampaignRepository:
 
     def create_image_metrics(self, metrics: ImageMetrics) -> ImageMetrics:
         """Create metrics for an image."""
-        metrics.compute_derived_metrics()
         self.session.add(metrics)
-        self.session.commit()
-        self.session.refresh(metrics)
+        self.session.flush()
+        return metrics
+
+    def create_image_metrics_many(self, metrics: list[ImageMetrics]) -> list[ImageMetrics]:
+        """Create metrics for several images with one batched INSERT."""
+        self.session.add_all(metrics)
+        self.session.flush()
         return metrics
 
     def get_image_metrics(self, image_id: UUID) -> ImageMetrics | None:
@@ -224,12 +445,15 @@ class CampaignRepository:
         statement = select(ImageMetrics).where(ImageMetrics.image_id == image_id)
         return self.session.exec(statement).first()
 
+    def get_metrics_by_image_ids(self, image_ids: list[UUID]) -> dict[UUID, ImageMetrics]:
+        """Get the metrics of several images in one query, keyed by image id (images without metrics are absent)."""
+        statement = select(ImageMetrics).where(ImageMetrics.image_id.in_(image_ids))
+        return {metrics.image_id: metrics for metrics in self.session.exec(statement)}
+
     def update_image_metrics(self, metrics: ImageMetrics) -> ImageMetrics:
         """Update metrics for an image."""
-        metrics.compute_derived_metrics()
         self.session.add(metrics)
-        self.session.commit()
-        self.session.refresh(metrics)
+        self.session.flush()
         return metrics
 
     # ---------------------------------------------------------
@@ -239,8 +463,7 @@ class CampaignRepository:
     def create_analysis_result(self, result: AnalysisResult) -> AnalysisResult:
         """Create an analysis result."""
         self.session.add(result)
-        self.session.commit()
-        self.session.refresh(result)
+        self.session.flush()
         return result
 
     def get_analysis_result(self, result_id: UUID) -> AnalysisResult | None:
@@ -252,36 +475,15 @@ class CampaignRepository:
         statement = select(AnalysisResult).where(AnalysisResult.step_id == step_id)
         return self.session.exec(statement).first()
 
+    def get_analysis_results_by_step_ids(self, step_ids: list[UUID]) -> dict[UUID, AnalysisResult]:
+        """Get the analysis results of several steps in one query, keyed by step id (steps without one are absent)."""
+        statement = select(AnalysisResult).where(AnalysisResult.step_id.in_(step_ids))
+        return {result.step_id: result for result in self.session.exec(statement)}
+
     # ---------------------------------------------------------
     # Full Campaign (with eager loading)
     # ---------------------------------------------------------
 
     def get_campaign_full(self, campaign_id: UUID) -> Campaign | None:
-        """Get a campaign with all nested relationships eagerly loaded."""
-        statement = (
-            select(Campaign)
-            .where(Campaign.id == campaign_id)
-            .options(
-                selectinload(Campaign.campaign_spec),
-                selectinload(Campaign.campaign_flows)
-                .selectinload(CampaignFlow.target_group),
-                selectinload(Campaign.campaign_flows)
-                .selectinload(CampaignFlow.steps)
-                .selectinload(FlowStep.generation_result)
-                .selectinload(GenerationResult.selected_assets),
-                selectinload(Campaign.campaign_flows)
-                .selectinload(CampaignFlow.steps)
-                .selectinload(FlowStep.generation_result)
-                .selectinload(GenerationResult.generated_images)
-                .selectinload(GeneratedImage.source_assets),
-                selectinload(Campaign.campaign_flows)
-                .selectinload(CampaignFlow.steps)
-                .selectinload(FlowStep.generation_result)
-                .selectinload(GenerationResult.generated_images)
-                .selectinload(GeneratedImage.metrics),
-                selectinload(Campaign.campaign_flows)
-                .selectinload(CampaignFlow.steps)
-                .selectinload(FlowStep.analysis_result),
-            )
-        )
-        return self.session.exec(statement).first()
+        """Get a campaign with all nested relationships eagerly loaded (see _campaign_full_statement)."""
+        return self.session.exec(CAMPAIGN_FULL_STATEMENT, params={'campaign_id': campaign_id}).first()
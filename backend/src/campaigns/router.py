@@ -1,23 +1,32 @@
 import logging
+import os
+from functools import lru_cache
 from pathlib import Path
+from stat import S_ISREG
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, Response
+from pydantic import TypeAdapter
 from sqlmodel import Session
 
 logger = logging.getLogger(__name__)
 
 # Directory where generated images are stored
-GENERATED_IMAGES_DIR = Path(__file__).parent.parent.parent / "generated-images"
+GENERATED_IMAGES_DIR = (Path(__file__).parent.parent.parent / "generated-images").resolve()
+
+# Generated images are never rewritten once saved
+GENERATED_IMAGE_CACHE_HEADERS = {'Cache-Control': 'public, max-age=31536000, immutable'}
 
 from campaign_specs.repository import CampaignSpecRepository
 from campaigns.models import (
     CampaignCreate,
     CampaignFlow,
+    CampaignFlowListItem,
     CampaignFullResponse,
     CampaignResponse,
     FlowStep,
+    FlowStepListItem,
     GeneratedImage,
 )
 from campaigns.repository import CampaignRepository
@@ -32,15 +41,20 @@ from database import get_session
 
 router = APIRouter(prefix='/campaigns', tags=['campaigns'])
 
+# Built once at import; the list routes validate column rows and serialize them to JSON bytes in one pass each
+campaign_list_adapter = TypeAdapter(list[CampaignResponse])
+flow_list_adapter = TypeAdapter(list[CampaignFlowListItem])
+step_list_adapter = TypeAdapter(list[FlowStepListItem])
+
 
-def get_campaign_service(session: Session = Depends(get_session)) -> CampaignService:
+def get_campaign_service(session: Session = Depends(get_session, scope='function')) -> CampaignService:
     """Dependency injection for CampaignService."""
     repository = CampaignRepository(session)
     return CampaignService(repository)
 
 
 def get_campaign_spec_repository(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope='function'),
 ) -> CampaignSpecRepository:
     """Dependency injection for CampaignSpecRepository."""
     return CampaignSpecRepository(session)
@@ -51,13 +65,33 @@ def get_campaign_spec_repository(
 # ---------------------------------------------------------
 
 
+@lru_cache(maxsize=4096)
+def _generated_image_meta(filename: str) -> tuple[os.stat_result, str]:
+    """
+    Stat a generated image and derive its ETag. Raises FileNotFoundError if it is not a regular file.
+
+    Generated images are written once and never modified or removed, so the result can be
+    cached for the life of the process; misses raise and are therefore not cached.
+    """
+    stat_result = (GENERATED_IMAGES_DIR / filename).stat()
+    # A path parameter cannot contain '/', so '.' and '..' (directories) are the only way out of the folder
+    if not S_ISREG(stat_result.st_mode):
+        raise FileNotFoundError(filename)
+    return stat_result, f'"{stat_result.st_size:x}-{int(stat_result.st_mtime):x}"'
+
+
 @router.get('/generated-images/{filename}')
-def get_generated_image_file(filename: str) -> FileResponse:
-    """Serve a generated image file."""
-    file_path = GENERATED_IMAGES_DIR / filename
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail=f'Image file not found: {file_path}')
-    return FileResponse(file_path)
+def get_generated_image_file(filename: str, if_none_match: str | None = Header(default=None)) -> Response:
+    """Serve a generated image file, answering 304 when the client already has it."""
+    try:
+        stat_result, etag = _generated_image_meta(filename)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f'Image file not found: {filename}')
+    headers = {'ETag': etag, **GENERATED_IMAGE_CACHE_HEADERS}
+    if if_none_match is not None and etag in (tag.strip() for tag in if_none_match.split(',')):
+        return Response(status_code=304, headers=headers)
+    # File names are unique per generated image, so the content behind a URL never changes
+    return FileResponse(GENERATED_IMAGES_DIR / filename, stat_result=stat_result, headers=headers)
 
 
 # ---------------------------------------------------------
@@ -72,21 +106,13 @@ def create_campaign(
     spec_repo: CampaignSpecRepository = Depends(get_campaign_spec_repository),
 ) -> CampaignResponse:
     """Create a new campaign from a campaign spec."""
-    logger.info(f"Creating campaign from spec_id: {data.campaign_spec_id}")
     spec = spec_repo.get_by_id(data.campaign_spec_id)
     if not spec:
-        logger.error(f"Campaign spec not found: {data.campaign_spec_id}")
+        logger.error("Campaign spec not found: %s", data.campaign_spec_id)
         raise HTTPException(status_code=404, detail='Campaign spec not found')
 
-    logger.info(f"Found spec: {spec.id} ({spec.name})")
-    logger.info(f"Spec has {len(spec.target_groups) if spec.target_groups else 0} target groups")
-    logger.info(f"Spec has {len(spec.base_assets) if spec.base_assets else 0} base assets")
-
-    if spec.target_groups:
-        for tg in spec.target_groups:
-            logger.info(f"  - Target group: {tg.id} ({tg.name})")
-    else:
-        logger.warning("No target groups found on spec!")
+    if not spec.target_groups:
+        logger.warning("No target groups found on spec %s", spec.id)
 
     try:
         campaign = service.create_campaign(data, spec)
@@ -108,17 +134,11 @@ def list_campaigns(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=1000),
     service: CampaignService = Depends(get_campaign_service),
-) -> list[CampaignResponse]:
+) -> Response:
     """Get all campaigns with pagination."""
-    campaigns = service.list_campaigns(skip=skip, limit=limit)
-    return [
-        CampaignResponse(
-            id=c.id,
-            created_at=c.created_at,
-            campaign_spec_id=c.campaign_spec_id,
-        )
-        for c in campaigns
-    ]
+    rows = service.list_campaigns(skip=skip, limit=limit)
+    body = campaign_list_adapter.dump_json(campaign_list_adapter.validate_python(rows, from_attributes=True))
+    return Response(content=body, media_type='application/json')
 
 
 @router.get('/{campaign_id}', response_model=CampaignResponse)
@@ -159,17 +179,18 @@ def get_campaign_full(
 # ---------------------------------------------------------
 
 
-@router.get('/{campaign_id}/flows', response_model=list[CampaignFlow])
+@router.get('/{campaign_id}/flows', response_model=list[CampaignFlowListItem])
 def list_flows(
     campaign_id: UUID,
     service: CampaignService = Depends(get_campaign_service),
-) -> list[CampaignFlow]:
+) -> Response:
     """Get all flows for a campaign."""
     try:
-        service.get_campaign(campaign_id)  # Verify campaign exists
+        rows = service.list_flow_rows(campaign_id)
     except CampaignNotFoundError:
         raise HTTPException(status_code=404, detail='Campaign not found')
-    return service.get_flows_by_campaign(campaign_id)
+    body = flow_list_adapter.dump_json(flow_list_adapter.validate_python(rows, from_attributes=True))
+    return Response(content=body, media_type='application/json')
 
 
 @router.get('/{campaign_id}/flows/{flow_id}', response_model=CampaignFlow)
@@ -180,12 +201,9 @@ def get_flow(
 ) -> CampaignFlow:
     """Get a specific flow by ID."""
     try:
-        flow = service.get_flow(flow_id)
-        if flow.campaign_id != campaign_id:
-            raise HTTPException(status_code=404, detail='Flow not found in this campaign')
-        return flow
+        return service.get_flow(flow_id, campaign_id)
     except FlowNotFoundError:
-        raise HTTPException(status_code=404, detail='Flow not found')
+        raise HTTPException(status_code=404, detail='Flow not found in this campaign')
 
 
 @router.get('/{campaign_id}/flows/{flow_id}/current-step', response_model=FlowStep | None)
@@ -196,12 +214,9 @@ def get_current_step(
 ) -> FlowStep | None:
     """Get the current (latest) step for a flow."""
     try:
-        flow = service.get_flow(flow_id)
-        if flow.campaign_id != campaign_id:
-            raise HTTPException(status_code=404, detail='Flow not found in this campaign')
-        return service.get_current_step(flow_id)
+        return service.get_current_step(flow_id, campaign_id)
     except FlowNotFoundError:
-        raise HTTPException(status_code=404, detail='Flow not found')
+        raise HTTPException(status_code=404, detail='Flow not found in this campaign')
 
 
 # ---------------------------------------------------------
@@ -209,20 +224,19 @@ def get_current_step(
 # ---------------------------------------------------------
 
 
-@router.get('/{campaign_id}/flows/{flow_id}/steps', response_model=list[FlowStep])
+@router.get('/{campaign_id}/flows/{flow_id}/steps', response_model=list[FlowStepListItem])
 def list_steps(
     campaign_id: UUID,
     flow_id: UUID,
     service: CampaignService = Depends(get_campaign_service),
-) -> list[FlowStep]:
+) -> Response:
     """Get all steps for a flow."""
     try:
-        flow = service.get_flow(flow_id)
-        if flow.campaign_id != campaign_id:
-            raise HTTPException(status_code=404, detail='Flow not found in this campaign')
-        return service.get_steps_by_flow(flow_id)
+        rows = service.list_step_rows(flow_id, campaign_id)
     except FlowNotFoundError:
-        raise HTTPException(status_code=404, detail='Flow not found')
+        raise HTTPException(status_code=404, detail='Flow not found in this campaign')
+    body = step_list_adapter.dump_json(step_list_adapter.validate_python(rows, from_attributes=True))
+    return Response(content=body, media_type='application/json')
 
 
 @router.get(
@@ -237,12 +251,9 @@ def get_step(
 ) -> FlowStep:
     """Get a specific step by ID."""
     try:
-        step = service.get_step(step_id)
-        if step.flow_id != flow_id:
-            raise HTTPException(status_code=404, detail='Step not found in this flow')
-        return step
+        return service.get_step(step_id, flow_id, campaign_id)
     except StepNotFoundError:
-        raise HTTPException(status_code=404, detail='Step not found')
+        raise HTTPException(status_code=404, detail='Step not found in this flow')
 
 
 @router.get(
@@ -257,9 +268,7 @@ def get_step_images(
 ) -> list[GeneratedImage]:
     """Get all generated images for a step."""
     try:
-        step = service.get_step(step_id)
-        if step.flow_id != flow_id:
-            raise HTTPException(status_code=404, detail='Step not found in this flow')
+        service.get_step(step_id, flow_id, campaign_id)
         return service.get_images_by_step(step_id)
     except StepNotFoundError:
-        raise HTTPException(status_code=404, detail='Step not found')
+        raise HTTPException(status_code=404, detail='Step not found in this flow')
@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime
 from uuid import UUID
 
 from campaigns.models import (
@@ -17,11 +18,18 @@ from campaigns.models import (
     ImageMetrics,
     ImageMetricsCreate,
 )
-from campaigns.repository import CampaignRepository
+from campaigns.repository import CampaignRepository, FlowRow, StepRow
 from models import CampaignSpec
 
 logger = logging.getLogger(__name__)
 
+# Target state -> (state the step must be in, result the step must already have, its name in errors)
+STEP_TRANSITIONS: dict[FlowStepState, tuple[FlowStepState, type[GenerationResult] | type[AnalysisResult] | None, str]] = {
+    FlowStepState.COLLECTING_DATA: (FlowStepState.GENERATING, GenerationResult, 'generation result'),
+    FlowStepState.ANALYZING: (FlowStepState.COLLECTING_DATA, None, ''),
+    FlowStepState.COMPLETED: (FlowStepState.ANALYZING, AnalysisResult, 'analysis result'),
+}
+
 
 class CampaignNotFoundError(Exception):
     """Raised when a campaign is not found."""
@@ -76,37 +84,29 @@ class CampaignService:
 
     def create_campaign(self, data: CampaignCreate, spec: CampaignSpec) -> Campaign:
         """Create a new campaign from a spec and initialize flows for each target group."""
-        logger.info(f"Creating campaign from spec: {spec.id} ({spec.name})")
+        logger.info("Creating campaign from spec: %s (%s)", spec.id, spec.name)
 
-        # Check if a campaign already exists for this spec
-        existing_campaigns = self.repository.get_campaigns_by_spec(data.campaign_spec_id)
-        if existing_campaigns:
-            logger.warning(f"Campaign already exists for spec {data.campaign_spec_id}")
+        campaign = self.repository.create_campaign(data.campaign_spec_id)
+        if campaign is None:
+            logger.warning("Campaign already exists for spec %s", data.campaign_spec_id)
             raise CampaignAlreadyExistsError(data.campaign_spec_id)
-
-        logger.info(f"Spec base_prompt: {spec.base_prompt[:50]}...")
-        logger.info(f"Spec target_groups attribute: {spec.target_groups}")
-        logger.info(f"Spec target_groups type: {type(spec.target_groups)}")
-        logger.info(f"Spec target_groups len: {len(spec.target_groups) if spec.target_groups else 'None'}")
-
-        campaign = Campaign(campaign_spec_id=data.campaign_spec_id)
-        campaign = self.repository.create_campaign(campaign)
-        logger.info(f"Created campaign: {campaign.id}")
+        logger.info("Created campaign: %s", campaign.id)
 
         # Create a flow for each target group in the spec
-        flow_count = 0
-        for target_group in spec.target_groups:
-            logger.info(f"Creating flow for target group: {target_group.id} ({target_group.name})")
-            flow = CampaignFlow(
+        flows = [
+            CampaignFlow(
                 campaign_id=campaign.id,
                 target_group_id=target_group.id,
                 initial_prompt=spec.base_prompt,
             )
-            self.repository.create_flow(flow)
-            flow_count += 1
-            logger.info(f"Created flow: {flow.id}")
-
-        logger.info(f"Total flows created: {flow_count}")
+            for target_group in spec.target_groups
+        ]
+        self.repository.create_flows_many(flows)
+        if logger.isEnabledFor(logging.DEBUG):
+            for flow, target_group in zip(flows, spec.target_groups, strict=True):
+                logger.debug("Created flow: %s for target group: %s (%s)", flow.id, target_group.id, target_group.name)
+
+        logger.info("Total flows created: %d", len(flows))
         return campaign
 
     def get_campaign(self, campaign_id: UUID) -> Campaign:
@@ -116,9 +116,9 @@ class CampaignService:
             raise CampaignNotFoundError(campaign_id)
         return campaign
 
-    def list_campaigns(self, skip: int = 0, limit: int = 100) -> list[Campaign]:
-        """List all campaigns."""
-        return self.repository.get_campaigns(skip=skip, limit=limit)
+    def list_campaigns(self, skip: int = 0, limit: int = 100) -> list[tuple[UUID, datetime, UUID]]:
+        """List all campaigns as (id, created_at, campaign_spec_id) rows."""
+        return self.repository.list_campaign_rows(skip=skip, limit=limit)
 
     def get_campaign_full(self, campaign_id: UUID) -> Campaign:
         """Get a campaign with all nested relationships (flows, steps, results)."""
@@ -131,91 +131,76 @@ class CampaignService:
     # Flow Operations
     # ---------------------------------------------------------
 
-    def get_flow(self, flow_id: UUID) -> CampaignFlow:
-        """Get a flow by ID."""
-        flow = self.repository.get_flow(flow_id)
+    def get_flow(self, flow_id: UUID, campaign_id: UUID | None = None) -> CampaignFlow:
+        """Get a flow by ID, optionally scoped to a campaign."""
+        if campaign_id is None:
+            flow = self.repository.get_flow(flow_id)
+        else:
+            flow = self.repository.get_flow_scoped(flow_id, campaign_id)
         if not flow:
             raise FlowNotFoundError(flow_id)
         return flow
 
-    def get_flows_by_campaign(self, campaign_id: UUID) -> list[CampaignFlow]:
-        """Get all flows for a campaign."""
-        return self.repository.get_flows_by_campaign(campaign_id)
+    def list_flow_rows(self, campaign_id: UUID) -> list[FlowRow]:
+        """Get all flows for a campaign as column rows. Raises CampaignNotFoundError if the campaign does not exist."""
+        flows = self.repository.list_flow_rows(campaign_id)
+        # Only an empty result needs the existence check
+        if not flows and not self.repository.campaign_exists(campaign_id):
+            raise CampaignNotFoundError(campaign_id)
+        return flows
 
-    def get_current_step(self, flow_id: UUID) -> FlowStep | None:
-        """Get the current (latest) step for a flow."""
-        return self.repository.get_latest_step(flow_id)
+    def get_current_step(self, flow_id: UUID, campaign_id: UUID | None = None) -> FlowStep | None:
+        """Get the current (latest) step for a flow, optionally scoped to a campaign."""
+        step = self.repository.get_latest_step(flow_id, campaign_id)
+        if step is None and campaign_id is not None and not self.repository.flow_exists(flow_id, campaign_id):
+            raise FlowNotFoundError(flow_id)
+        return step
 
     # ---------------------------------------------------------
     # Step Operations
     # ---------------------------------------------------------
 
     def create_step(self, data: FlowStepCreate) -> FlowStep:
-        """Create a new step for a flow."""
-        # Get the latest step to determine iteration
-        latest_step = self.repository.get_latest_step(data.flow_id)
-        iteration = (latest_step.iteration + 1) if latest_step else 0
-
-        step = FlowStep(
-            flow_id=data.flow_id,
-            iteration=iteration,
-            state=FlowStepState.GENERATING,
+        """Create the next step (GENERATING) for a flow."""
+        return self.repository.create_next_step(
+            data.flow_id,
             input_embedding=data.input_embedding,
             input_insights=data.input_insights,
         )
-        return self.repository.create_step(step)
 
-    def get_step(self, step_id: UUID) -> FlowStep:
-        """Get a step by ID."""
-        step = self.repository.get_step(step_id)
+    def get_step(self, step_id: UUID, flow_id: UUID | None = None, campaign_id: UUID | None = None) -> FlowStep:
+        """Get a step by ID, optionally scoped to a flow (and that flow to a campaign)."""
+        if flow_id is None:
+            step = self.repository.get_step(step_id)
+        else:
+            step = self.repository.get_step_scoped(step_id, flow_id, campaign_id)
         if not step:
             raise StepNotFoundError(step_id)
         return step
 
-    def get_steps_by_flow(self, flow_id: UUID) -> list[FlowStep]:
-        """Get all steps for a flow."""
-        return self.repository.get_steps_by_flow(flow_id)
+    def list_step_rows(self, flow_id: UUID, campaign_id: UUID | None = None) -> list[StepRow]:
+        """Get all steps for a flow as column rows, optionally scoped to a campaign."""
+        steps = self.repository.list_step_rows(flow_id, campaign_id)
+        if not steps and campaign_id is not None and not self.repository.flow_exists(flow_id, campaign_id):
+            raise FlowNotFoundError(flow_id)
+        return steps
 
     # ---------------------------------------------------------
     # State Transitions
     # ---------------------------------------------------------
 
-    def transition_to_collecting(self, step_id: UUID) -> FlowStep:
-        """Transition step from GENERATING to COLLECTING_DATA."""
-        step = self.get_step(step_id)
-        if step.state != FlowStepState.GENERATING:
-            raise InvalidStateTransitionError(step.state, FlowStepState.COLLECTING_DATA)
-
-        # Verify generation result exists
-        gen_result = self.repository.get_generation_result_by_step(step_id)
-        if not gen_result:
-            raise ValueError('Cannot transition: generation result not created')
+    def transition(self, step_id: UUID, target_state: FlowStepState) -> FlowStep:
+        """Move a step to `target_state` as allowed by STEP_TRANSITIONS, in a single guarded UPDATE."""
+        source_state, required_result, required_name = STEP_TRANSITIONS[target_state]
+        step = self.repository.transition_step(step_id, source_state, target_state, required_result)
+        if step is not None:
+            return step
 
-        step.state = FlowStepState.COLLECTING_DATA
-        return self.repository.update_step(step)
-
-    def transition_to_analyzing(self, step_id: UUID) -> FlowStep:
-        """Transition step from COLLECTING_DATA to ANALYZING."""
+        # Nothing was updated; work out which condition failed
         step = self.get_step(step_id)
-        if step.state != FlowStepState.COLLECTING_DATA:
-            raise InvalidStateTransitionError(step.state, FlowStepState.ANALYZING)
-
-        step.state = FlowStepState.ANALYZING
-        return self.repository.update_step(step)
-
-    def transition_to_completed(self, step_id: UUID) -> FlowStep:
-        """Transition step from ANALYZING to COMPLETED."""
-        step = self.get_step(step_id)
-        if step.state != FlowStepState.ANALYZING:
-            raise InvalidStateTransitionError(step.state, FlowStepState.COMPLETED)
-
-        # Verify analysis result exists
-        analysis = self.repository.get_analysis_result_by_step(step_id)
-        if not analysis:
-            raise ValueError('Cannot transition: analysis result not created')
-
-        step.state = FlowStepState.COMPLETED
-        return self.repository.update_step(step)
+        if step.state != source_state:
+            raise InvalidStateTransitionError(step.state, target_state)
+        raise ValueError(f'Cannot transition: {required_name} not created')
 
     # ---------------------------------------------------------
     # Generation Result Operations
@@ -231,8 +216,7 @@ class CampaignService:
         result = self.repository.create_generation_result(result)
 
         # Link selected assets
-        for asset_id in data.selected_asset_ids:
-            self.repository.add_generation_result_asset(result.id, asset_id)
+        self.repository.add_generation_result_assets(result.id, data.selected_asset_ids)
 
         return result
 
@@ -255,17 +239,13 @@ class CampaignService:
         image = self.repository.create_generated_image(image)
 
         # Link source assets
-        for asset_id in data.source_asset_ids:
-            self.repository.add_generated_image_asset(image.id, asset_id)
+        self.repository.add_generated_image_assets(image.id, data.source_asset_ids)
 
         return image
 
     def get_images_by_step(self, step_id: UUID) -> list[GeneratedImage]:
         """Get all generated images for a step."""
-        gen_result = self.repository.get_generation_result_by_step(step_id)
-        if not gen_result:
-            return []
-        return self.repository.get_images_by_generation_result(gen_result.id)
+        return self.repository.get_images_by_step(step_id)
 
     # ---------------------------------------------------------
     # Image Metrics Operations
@@ -282,6 +262,20 @@ class CampaignService:
         )
         return self.repository.create_image_metrics(metrics)
 
+    def create_image_metrics_many(self, data: list[ImageMetricsCreate]) -> list[ImageMetrics]:
+        """Create metrics for several images at once."""
+        metrics = [
+            ImageMetrics(
+                image_id=item.image_id,
+                impressions=item.impressions,
+                clicks=item.clicks,
+                conversions=item.conversions,
+                cost=item.cost,
+            )
+            for item in data
+        ]
+        return self.repository.create_image_metrics_many(metrics)
+
     def get_image_metrics(self, image_id: UUID) -> ImageMetrics | None:
         """Get metrics for an image."""
         return self.repository.get_image_metrics(image_id)
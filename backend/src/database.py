@@ -1,3 +1,4 @@
+import logging
 import os
 from collections.abc import Generator
 
@@ -8,8 +9,9 @@ try:
 except ImportError:
     pass
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import Connection, Index, create_engine, func, inspect, select, text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateColumn
 from sqlmodel import Session, SQLModel
 
 from campaigns.models import *  # noqa: F403
@@ -17,6 +19,8 @@ from campaigns.models import *  # noqa: F403
 # Import models to register them with SQLModel
 from models import *  # noqa: F403
 
+logger = logging.getLogger(__name__)
+
 # Database configuration
 DATABASE_URL = os.getenv(
     'DATABASE_URL',
@@ -59,17 +63,147 @@ def ensure_database_exists() -> None:
         pass
 
 
-# Create engine
-engine = create_engine(DATABASE_URL, echo=False)
+# Connection pool size. Sync routes run in a worker thread pool sized to match
+# (see main.lifespan), so a request thread never queues on pool checkout.
+# The pool is per process: with several server workers, keep
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below the server's max_connections (100 by default).
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '20'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '20'))
+
+# Seconds to wait for a free connection before failing, instead of hanging a saturated process for 30s
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '5'))
+
+# Seconds after which a pooled connection is replaced. Kept below typical server/proxy idle
+# timeouts (PgBouncer's server_idle_timeout defaults to 600), so stale connections are
+# retired by age instead of being pinged on every checkout
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '300'))
+
+# A pre-ping costs a SELECT 1 round trip per checkout, i.e. per request; enable it only
+# where connections are dropped before DB_POOL_RECYCLE elapses
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'false').lower() in ('1', 'true', 'yes')
+
+# Statement logging for local debugging only; formatting every statement is costly under load
+SQL_ECHO = os.getenv('SQL_ECHO', 'false').lower() in ('1', 'true', 'yes')
+
+# psycopg2 uses no server-side prepared statements, so the engine also works behind
+# PgBouncer in transaction pooling mode
+engine = create_engine(
+    DATABASE_URL,
+    echo=SQL_ECHO,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    pool_recycle=DB_POOL_RECYCLE,
+    # Multi-row INSERTs are sent as batched VALUES lists, other executemany calls through execute_batch
+    executemany_mode='values_plus_batch',
+    insertmanyvalues_page_size=1000,
+)
 
 
 def create_db_and_tables() -> None:
     """Create database and tables from SQLModel models."""
     ensure_database_exists()
     SQLModel.metadata.create_all(engine)
+    ensure_indexes()
+    ensure_column_types()
+
+
+# Index -> the composite or unique index that supersedes it by starting with the same column (or, for
+# flowstep.iteration, that makes it pointless: it is never useful without flow_id). Dropped from
+# databases created before the change, once the superseding index exists.
+REDUNDANT_INDEXES = {
+    'ix_campaign_campaign_spec_id': 'ix_campaign_campaign_spec_id_unique',
+    'ix_campaignflow_campaign_id': 'ix_campaignflow_campaign_id_target_group_id',
+    'ix_flowstep_flow_id': 'ix_flowstep_flow_id_iteration',
+    'ix_flowstep_iteration': 'ix_flowstep_flow_id_iteration',
+}
+
+
+# Unique indexes ensure_indexes could not create because the table holds duplicates. Code that relies
+# on one of them for a uniqueness rule checks this set and enforces the rule itself while it is missing.
+skipped_unique_indexes: set[str] = set()
+
+
+def ensure_indexes() -> None:
+    """Create indexes added to models after their table already existed (create_all skips those tables)."""
+    with engine.begin() as conn:
+        existing = {table.name: {ix['name'] for ix in inspect(conn).get_indexes(table.name)} for table in SQLModel.metadata.sorted_tables}
+        skipped_unique_indexes.clear()
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in existing[table.name]:
+                    continue
+                if index.unique and _has_duplicates(conn, index):
+                    logger.error(
+                        'Not creating unique index %s: %s has rows with duplicate (%s). '
+                        'Remove the duplicates and restart to create it.',
+                        index.name,
+                        table.name,
+                        ', '.join(column.name for column in index.columns),
+                    )
+                    skipped_unique_indexes.add(index.name)
+                    continue
+                index.create(conn)
+        for index_name, superseded_by in REDUNDANT_INDEXES.items():
+            # Keep the old index while its replacement could not be created
+            if superseded_by not in skipped_unique_indexes:
+                conn.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+
+
+def _has_duplicates(conn: Connection, index: Index) -> bool:
+    """Whether the index's table has rows that share values in all of its columns."""
+    columns = list(index.columns)
+    statement = select(*columns).group_by(*columns).having(func.count() > 1).limit(1)
+    return conn.execute(statement).first() is not None
+
+
+def ensure_column_types() -> None:
+    """Convert columns whose type changed after their table already existed (create_all never alters columns)."""
+    with engine.begin() as conn:
+        udt_name = conn.execute(
+            text(
+                "SELECT udt_name FROM information_schema.columns "
+                "WHERE table_name = 'analysisresult' AND column_name = 'winner_image_ids'"
+            )
+        ).scalar()
+        # winner_image_ids used to be varchar[]; native uuid[] is 16 bytes per id instead of 36 chars of text
+        if udt_name == '_varchar':
+            conn.execute(
+                text('ALTER TABLE analysisresult ALTER COLUMN winner_image_ids TYPE uuid[] USING winner_image_ids::uuid[]')
+            )
+
+        # Columns that became generated (e.g. ImageMetrics.ctr) cannot be altered in place: drop and re-add them
+        for table in SQLModel.metadata.sorted_tables:
+            for column in table.columns:
+                if column.computed is None:
+                    continue
+                is_generated = conn.execute(
+                    text(
+                        'SELECT is_generated FROM information_schema.columns '
+                        'WHERE table_name = :table_name AND column_name = :column_name'
+                    ),
+                    {'table_name': table.name, 'column_name': column.name},
+                ).scalar()
+                if is_generated == 'NEVER':
+                    column_ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} DROP COLUMN {column.name}, ADD COLUMN {column_ddl}'))
 
 
 def get_session() -> Generator[Session]:
-    """Dependency to get database session."""
-    with Session(engine) as session:
-        yield session
+    """
+    Dependency to get database session. Commits once if the request succeeds, rolls back otherwise.
+
+    Declare it as Depends(get_session, scope='function') so the commit runs before the
+    response is sent; with the default request scope it would run after the client
+    already has its response.
+    """
+    # All column values are set in Python or returned by the INSERT, so objects stay valid
+    # after a commit; expiring them would only cost a SELECT per object on next access
+    with Session(engine, expire_on_commit=False) as session:
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
@@ -5,142 +5,160 @@ This module contains reusable functions extracted from the steps/ folder,
 organized by domain with clear input/output types.
 """
 
-from .analysis import analyze_winning_images, select_top_images_by_score
-from .analytics import generate_analytics_for_images
-from .asset_processor import (
-    get_assets_needing_processing,
-    process_and_update_asset,
-    process_and_update_assets_batch,
-    process_asset_async,
-    process_assets_batch,
-)
-from .asset_selection import (
-    get_base_and_reference_assets,
-    group_assets_by_type,
-    select_asset_sets,
-    select_single_asset_set,
-)
-from .embedding import compute_mean_embedding, create_embedding, create_embedding_simple
-from .image import describe_image, describe_image_from_path, describe_image_from_url
-from .image_generator import (
-    FluxGenerationError,
-    ImageGenerationResult,
-    generate_image_with_flux,
-    generate_images_batch,
-)
-from .orchestrator import (
-    CampaignInitResult,
-    FlowOrchestrator,
-    Job,
-    JobResult,
-    JobType,
-    OrchestrationConfig,
-)
-from .prompt import build_flux_prompt, generate_initial_prompt, modify_prompt_from_analysis
-from .similarity import (
-    cosine_similarity,
-    filter_assets_by_iteration,
-    filter_assets_by_similarity,
-    get_top_k_similar_assets,
-)
-from .types import (
-    # Analytics types
-    AnalyticsGenerationInput,
-    AnalyticsGenerationOutput,
-    # Asset processing types
-    AssetProcessingInput,
-    AssetProcessingOutput,
-    # Asset selection types
-    AssetSelectionInput,
-    AssetSelectionOutput,
-    AssetSet,
-    AssetWithScore,
-    # Embedding types
-    EmbeddingInput,
-    EmbeddingOutput,
-    GeneratedAnalytics,
-    # Image analysis types
-    ImageAnalysisInput,
-    ImageAnalysisOutput,
-    # Image description types
-    ImageDescriptionInput,
-    ImageDescriptionOutput,
-    # Prompt types
-    PromptGenerationInput,
-    PromptGenerationOutput,
-    PromptModificationInput,
-    PromptModificationOutput,
-    # Similarity types
-    SimilarityInput,
-    SimilarityOutput,
-)
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = [
+if TYPE_CHECKING:
+    from .analysis import analyze_winning_images, select_top_images_by_score
+    from .analytics import generate_analytics_for_images
+    from .asset_processor import (
+        get_assets_needing_processing,
+        process_and_update_asset,
+        process_and_update_assets_batch,
+        process_asset_async,
+        process_assets_batch,
+    )
+    from .asset_selection import (
+        get_base_and_reference_assets,
+        group_assets_by_type,
+        select_asset_sets,
+        select_single_asset_set,
+    )
+    from .embedding import compute_mean_embedding, create_embedding, create_embedding_simple
+    from .image import describe_image, describe_image_from_path, describe_image_from_url
+    from .image_generator import (
+        FluxGenerationError,
+        ImageGenerationResult,
+        generate_image_with_flux,
+        generate_images_batch,
+    )
+    from .orchestrator import (
+        CampaignInitResult,
+        FlowOrchestrator,
+        Job,
+        JobResult,
+        JobType,
+        OrchestrationConfig,
+    )
+    from .prompt import build_flux_prompt, generate_initial_prompt, modify_prompt_from_analysis
+    from .similarity import (
+        cosine_similarity,
+        filter_assets_by_iteration,
+        filter_assets_by_similarity,
+        get_top_k_similar_assets,
+    )
+    from .types import (
+        # Analytics types
+        AnalyticsGenerationInput,
+        AnalyticsGenerationOutput,
+        # Asset processing types
+        AssetProcessingInput,
+        AssetProcessingOutput,
+        # Asset selection types
+        AssetSelectionInput,
+        AssetSelectionOutput,
+        AssetSet,
+        AssetWithScore,
+        # Embedding types
+        EmbeddingInput,
+        EmbeddingOutput,
+        GeneratedAnalytics,
+        # Image analysis types
+        ImageAnalysisInput,
+        ImageAnalysisOutput,
+        # Image description types
+        ImageDescriptionInput,
+        ImageDescriptionOutput,
+        # Prompt types
+        PromptGenerationInput,
+        PromptGenerationOutput,
+        PromptModificationInput,
+        PromptModificationOutput,
+        # Similarity types
+        SimilarityInput,
+        SimilarityOutput,
+    )
+
+# Public name -> submodule that defines it. Submodules are imported on first access
+# (PEP 562), so importing one of them, e.g. functions.router, does not pull in the rest.
+_LAZY_IMPORTS = {
     # Types
-    'ImageDescriptionInput',
-    'ImageDescriptionOutput',
-    'EmbeddingInput',
-    'EmbeddingOutput',
-    'AnalyticsGenerationInput',
-    'AnalyticsGenerationOutput',
-    'GeneratedAnalytics',
-    'AssetSelectionInput',
-    'AssetSelectionOutput',
-    'AssetSet',
-    'SimilarityInput',
-    'SimilarityOutput',
-    'AssetWithScore',
-    'PromptGenerationInput',
-    'PromptGenerationOutput',
-    'PromptModificationInput',
-    'PromptModificationOutput',
-    'ImageAnalysisInput',
-    'ImageAnalysisOutput',
-    'AssetProcessingInput',
-    'AssetProcessingOutput',
+    'ImageDescriptionInput': 'types',
+    'ImageDescriptionOutput': 'types',
+    'EmbeddingInput': 'types',
+    'EmbeddingOutput': 'types',
+    'AnalyticsGenerationInput': 'types',
+    'AnalyticsGenerationOutput': 'types',
+    'GeneratedAnalytics': 'types',
+    'AssetSelectionInput': 'types',
+    'AssetSelectionOutput': 'types',
+    'AssetSet': 'types',
+    'SimilarityInput': 'types',
+    'SimilarityOutput': 'types',
+    'AssetWithScore': 'types',
+    'PromptGenerationInput': 'types',
+    'PromptGenerationOutput': 'types',
+    'PromptModificationInput': 'types',
+    'PromptModificationOutput': 'types',
+    'ImageAnalysisInput': 'types',
+    'ImageAnalysisOutput': 'types',
+    'AssetProcessingInput': 'types',
+    'AssetProcessingOutput': 'types',
     # Image functions
-    'describe_image',
-    'describe_image_from_url',
-    'describe_image_from_path',
+    'describe_image': 'image',
+    'describe_image_from_url': 'image',
+    'describe_image_from_path': 'image',
     # Embedding functions
-    'create_embedding',
-    'compute_mean_embedding',
-    'create_embedding_simple',
+    'create_embedding': 'embedding',
+    'compute_mean_embedding': 'embedding',
+    'create_embedding_simple': 'embedding',
     # Similarity functions
-    'cosine_similarity',
-    'filter_assets_by_similarity',
-    'get_top_k_similar_assets',
-    'filter_assets_by_iteration',
+    'cosine_similarity': 'similarity',
+    'filter_assets_by_similarity': 'similarity',
+    'get_top_k_similar_assets': 'similarity',
+    'filter_assets_by_iteration': 'similarity',
     # Asset selection functions
-    'select_asset_sets',
-    'group_assets_by_type',
-    'select_single_asset_set',
-    'get_base_and_reference_assets',
+    'select_asset_sets': 'asset_selection',
+    'group_assets_by_type': 'asset_selection',
+    'select_single_asset_set': 'asset_selection',
+    'get_base_and_reference_assets': 'asset_selection',
     # Analytics functions
-    'generate_analytics_for_images',
+    'generate_analytics_for_images': 'analytics',
     # Prompt functions
-    'generate_initial_prompt',
-    'modify_prompt_from_analysis',
-    'build_flux_prompt',
+    'generate_initial_prompt': 'prompt',
+    'modify_prompt_from_analysis': 'prompt',
+    'build_flux_prompt': 'prompt',
     # Analysis functions
-    'analyze_winning_images',
-    'select_top_images_by_score',
+    'analyze_winning_images': 'analysis',
+    'select_top_images_by_score': 'analysis',
     # Asset processor functions
-    'process_asset_async',
-    'process_assets_batch',
-    'process_and_update_asset',
-    'process_and_update_assets_batch',
-    'get_assets_needing_processing',
+    'process_asset_async': 'asset_processor',
+    'process_assets_batch': 'asset_processor',
+    'process_and_update_asset': 'asset_processor',
+    'process_and_update_assets_batch': 'asset_processor',
+    'get_assets_needing_processing': 'asset_processor',
     # Image generator functions
-    'generate_image_with_flux',
-    'generate_images_batch',
-    'ImageGenerationResult',
-    'FluxGenerationError',
+    'generate_image_with_flux': 'image_generator',
+    'generate_images_batch': 'image_generator',
+    'ImageGenerationResult': 'image_generator',
+    'FluxGenerationError': 'image_generator',
     # Orchestrator
-    'FlowOrchestrator',
-    'OrchestrationConfig',
-    'Job',
-    'JobType',
-    'JobResult',
-    'CampaignInitResult',
-]
+    'FlowOrchestrator': 'orchestrator',
+    'OrchestrationConfig': 'orchestrator',
+    'Job': 'orchestrator',
+    'JobType': 'orchestrator',
+    'JobResult': 'orchestrator',
+    'CampaignInitResult': 'orchestrator',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule defining `name` on first access and cache the attribute."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
@@ -13,10 +13,11 @@ from uuid import UUID
 from openai import (
     APIConnectionError,
     APIError,
-    AsyncOpenAI,
     RateLimitError,
 )
 
+from openai_client import get_async_openai_client
+
 from .types import ImageAnalysisInput, ImageAnalysisOutput
 
 DEFAULT_MODEL = 'gpt-4o-mini'
@@ -54,7 +55,7 @@ async def analyze_winning_images(input_data: ImageAnalysisInput) -> ImageAnalysi
             model_used=input_data.model,
         )
 
-    client = AsyncOpenAI()
+    client = get_async_openai_client()
 
     # Build context for winning images
     winning_context = []
@@ -14,11 +14,11 @@ from uuid import UUID
 from openai import (
     APIConnectionError,
     APIError,
-    AsyncOpenAI,
     RateLimitError,
 )
 
 from models import TargetGroup
+from openai_client import get_async_openai_client
 
 from .types import (
     AnalyticsGenerationInput,
@@ -120,7 +120,7 @@ async def generate_analytics_for_images(
             used_fallback=True,
         )
 
-    client = AsyncOpenAI()
+    client = get_async_openai_client()
     target_group_context = _build_target_group_context(input_data.target_group)
 
     # Build image descriptions for the prompt
@@ -10,15 +10,16 @@ import sys
 from openai import (
     APIConnectionError,
     APIError,
-    OpenAI,
     RateLimitError,
 )
 
+from openai_client import get_openai_client
+
 from .types import EmbeddingInput, EmbeddingOutput
 
 DEFAULT_MODEL = 'text-embedding-3-small'
 FALLBACK_DIM = 1536  # text-embedding-3-small has 1536 dimensions
-FALLBACK_EMBEDDING = [0.0] * FALLBACK_DIM
+FALLBACK_EMBEDDING = (0.0,) * FALLBACK_DIM  # immutable template, copied per output
 
 
 def create_embedding(input_data: EmbeddingInput) -> EmbeddingOutput:
@@ -41,13 +42,13 @@ def create_embedding(input_data: EmbeddingInput) -> EmbeddingOutput:
             file=sys.stderr,
         )
         return EmbeddingOutput(
-            embedding=FALLBACK_EMBEDDING,
+            embedding=list(FALLBACK_EMBEDDING),
             model_used=input_data.model,
             input_length=len(text),
             used_fallback=True,
         )
 
-    client = OpenAI()
+    client = get_openai_client()
 
     try:
         response = client.embeddings.create(
@@ -68,7 +69,7 @@ def create_embedding(input_data: EmbeddingInput) -> EmbeddingOutput:
             file=sys.stderr,
         )
         return EmbeddingOutput(
-            embedding=FALLBACK_EMBEDDING,
+            embedding=list(FALLBACK_EMBEDDING),
             model_used=input_data.model,
             input_length=len(text),
             used_fallback=True,
@@ -80,7 +81,7 @@ def create_embedding(input_data: EmbeddingInput) -> EmbeddingOutput:
             file=sys.stderr,
         )
         return EmbeddingOutput(
-            embedding=FALLBACK_EMBEDDING,
+            embedding=list(FALLBACK_EMBEDDING),
             model_used=input_data.model,
             input_length=len(text),
             used_fallback=True,
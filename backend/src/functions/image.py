@@ -13,10 +13,11 @@ from pathlib import Path
 from openai import (
     APIConnectionError,
     APIError,
-    AsyncOpenAI,
     RateLimitError,
 )
 
+from openai_client import get_async_openai_client
+
 from .types import ImageDescriptionInput, ImageDescriptionOutput
 
 DEFAULT_MODEL = 'gpt-4o-mini'
@@ -84,7 +85,7 @@ async def describe_image(input_data: ImageDescriptionInput) -> ImageDescriptionO
             used_fallback=True,
         )
 
-    client = AsyncOpenAI()
+    client = get_async_openai_client()
     image_url = _get_image_data_url(input_data)
 
     messages = [
@@ -167,8 +167,7 @@ class FlowOrchestrator:
             campaign_spec,
         )
 
-        # Refresh to get the flows
-        self.session.refresh(campaign)
+        self.session.commit()
 
         # Collect flow IDs and target group names
         flow_ids: list[UUID] = []
@@ -215,6 +214,7 @@ class FlowOrchestrator:
         for job in init_result.initial_jobs:
             if job.job_type == JobType.CREATE_FIRST_STEP:
                 await self._execute_create_first_step(job, campaign_spec)
+        self.session.commit()
 
         # Get the updated jobs (should now be RUN_GENERATING)
         updated_jobs = self.get_all_pending_jobs(init_result.campaign_id)
@@ -383,35 +383,47 @@ class FlowOrchestrator:
             JobResult with success status and next job
         """
         try:
-            if job.job_type == JobType.CREATE_FIRST_STEP:
-                return await self._execute_create_first_step(job, campaign_spec)
+            result = await self._run_job(job, assets, campaign_spec)
+        except Exception as e:
+            # Rollback transaction on error to prevent cascading failures
+            self.session.rollback()
+            return JobResult(
+                job=job,
+                success=False,
+                error=str(e),
+            )
 
-            elif job.job_type == JobType.RUN_GENERATING:
-                return await self._execute_generating(job, assets, campaign_spec)
+        # Repository writes only flush; everything the job wrote is committed here at once
+        self.session.commit()
+        return result
+
+    async def _run_job(
+        self,
+        job: Job,
+        assets: list[Asset],
+        campaign_spec: CampaignSpec,
+    ) -> JobResult:
+        """Dispatch a job to the handler for its type. Does not commit."""
+        if job.job_type == JobType.CREATE_FIRST_STEP:
+            return await self._execute_create_first_step(job, campaign_spec)
 
-            elif job.job_type == JobType.RUN_COLLECTING_DATA:
-                return await self._execute_collecting_data(job)
+        elif job.job_type == JobType.RUN_GENERATING:
+            return await self._execute_generating(job, assets, campaign_spec)
 
-            elif job.job_type == JobType.RUN_ANALYZING:
-                return await self._execute_analyzing(job, campaign_spec)
+        elif job.job_type == JobType.RUN_COLLECTING_DATA:
+            return await self._execute_collecting_data(job)
 
-            elif job.job_type == JobType.CREATE_NEXT_ITERATION:
-                return await self._execute_create_next_iteration(job)
+        elif job.job_type == JobType.RUN_ANALYZING:
+            return await self._execute_analyzing(job, campaign_spec)
 
-            else:
-                return JobResult(
-                    job=job,
-                    success=False,
-                    error=f"Unknown job type: {job.job_type}",
-                )
+        elif job.job_type == JobType.CREATE_NEXT_ITERATION:
+            return await self._execute_create_next_iteration(job)
 
-        except Exception as e:
-            # Rollback transaction on error to prevent cascading failures
-            self.session.rollback()
+        else:
             return JobResult(
                 job=job,
                 success=False,
-                error=str(e),
+                error=f"Unknown job type: {job.job_type}",
             )
 
     async def run_next_job(
@@ -564,8 +576,11 @@ class FlowOrchestrator:
                 selected_asset_ids=list(all_selected_asset_ids),
             )
         )
+        # Commit before the slow image generation calls so the connection does not sit
+        # idle in transaction while they run; images are written after the loop
+        self.session.commit()
 
-        generated_image_ids: list[UUID] = []
+        generated_images: list[GeneratedImageCreate] = []
 
         logger.info(
             f"Generating images for step {step.id}: "
@@ -604,7 +619,7 @@ class FlowOrchestrator:
             )
 
             if image_result.success and image_result.image_url:
-                image = self.service.create_generated_image(
+                generated_images.append(
                     GeneratedImageCreate(
                         generation_result_id=gen_result.id,
                         file_name=image_result.image_url,
@@ -613,13 +628,14 @@ class FlowOrchestrator:
                         source_asset_ids=asset_set.asset_ids,
                     )
                 )
-                generated_image_ids.append(image.id)
-                logger.info(f"Asset set {i}: Image generated successfully: {image.id}")
+                logger.info(f"Asset set {i}: Image generated successfully: {image_result.image_url}")
             else:
                 logger.error(
                     f"Asset set {i}: Image generation failed: {image_result.error}"
                 )
 
+        generated_image_ids = [self.service.create_generated_image(data).id for data in generated_images]
+
         # Check if any images were generated
         if not generated_image_ids:
             logger.error(
@@ -636,7 +652,7 @@ class FlowOrchestrator:
             )
 
         # Transition to COLLECTING_DATA
-        self.service.transition_to_collecting(step.id)
+        self.service.transition(step.id, FlowStepState.COLLECTING_DATA)
 
         return JobResult(
             job=job,
@@ -705,8 +721,8 @@ class FlowOrchestrator:
         analytics_output = await generate_analytics_for_images(analytics_input)
 
         # Store metrics
-        for analytics in analytics_output.analytics:
-            self.service.create_image_metrics(
+        self.service.create_image_metrics_many(
+            [
                 ImageMetricsCreate(
                     image_id=analytics.image_id,
                     impressions=analytics.impressions,
@@ -714,10 +730,12 @@ class FlowOrchestrator:
                     conversions=analytics.conversions,
                     cost=analytics.cost,
                 )
-            )
+                for analytics in analytics_output.analytics
+            ]
+        )
 
         # Transition to ANALYZING
-        self.service.transition_to_analyzing(step.id)
+        self.service.transition(step.id, FlowStepState.ANALYZING)
 
         return JobResult(
             job=job,
@@ -758,8 +776,9 @@ class FlowOrchestrator:
         image_analytics: list[tuple[UUID, dict]] = []
         image_descriptions: dict[UUID, str] = {}
 
+        metrics_by_image = self.repository.get_metrics_by_image_ids([image.id for image in images])
         for image in images:
-            metrics = self.repository.get_image_metrics(image.id)
+            metrics = metrics_by_image.get(image.id)
             if metrics:
                 image_analytics.append((
                     image.id,
@@ -838,7 +857,7 @@ class FlowOrchestrator:
         )
 
         # Transition to COMPLETED
-        self.service.transition_to_completed(step.id)
+        self.service.transition(step.id, FlowStepState.COMPLETED)
 
         # Determine next job
         max_iterations = campaign_spec.max_iterations
@@ -942,10 +961,16 @@ class FlowOrchestrator:
         steps = self.repository.get_steps_by_flow(flow_id)
         job = self._get_job_for_flow(flow)
 
+        # One query per kind of child row for all steps, instead of one per step
+        step_ids = [step.id for step in steps]
+        gen_results = self.repository.get_generation_results_by_step_ids(step_ids)
+        analyses = self.repository.get_analysis_results_by_step_ids(step_ids)
+        images_by_result = self.repository.get_images_by_generation_results([result.id for result in gen_results.values()])
+
         step_details = []
         for step in steps:
-            gen_result = self.repository.get_generation_result_by_step(step.id)
-            analysis = self.repository.get_analysis_result_by_step(step.id)
+            gen_result = gen_results.get(step.id)
+            analysis = analyses.get(step.id)
 
             step_details.append({
                 "step_id": str(step.id),
@@ -953,7 +978,7 @@ class FlowOrchestrator:
                 "state": step.state.value,
                 "has_generation_result": gen_result is not None,
                 "has_analysis_result": analysis is not None,
-                "image_count": len(gen_result.generated_images) if gen_result else 0,
+                "image_count": len(images_by_result[gen_result.id]) if gen_result else 0,
             })
 
         return {
@@ -12,11 +12,11 @@ import sys
 from openai import (
     APIConnectionError,
     APIError,
-    AsyncOpenAI,
     RateLimitError,
 )
 
 from models import Asset, AssetType
+from openai_client import get_async_openai_client
 
 from .types import (
     AssetSet,
@@ -123,7 +123,7 @@ async def modify_prompt_from_analysis(
             model_used=input_data.model,
         )
 
-    client = AsyncOpenAI()
+    client = get_async_openai_client()
 
     # Build target group context
     target_parts = [f"Target Group: {input_data.target_group.name}"]
@@ -56,7 +56,7 @@ async def run_pending_jobs(max_jobs: int = 10) -> dict:
 @router.get('/campaigns/{campaign_id}/status')
 def get_campaign_status(
     campaign_id: UUID,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope='function'),
 ) -> dict:
     """Get the status of a specific campaign including pending jobs."""
     orchestrator = FlowOrchestrator(session)
@@ -66,7 +66,7 @@ def get_campaign_status(
 @router.get('/flows/{flow_id}/status')
 def get_flow_status(
     flow_id: UUID,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope='function'),
 ) -> dict:
     """Get detailed status of a specific flow."""
     orchestrator = FlowOrchestrator(session)
@@ -77,7 +77,7 @@ def get_flow_status(
 async def run_campaign_jobs(
     campaign_id: UUID,
     max_jobs: int = 10,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_session, scope='function'),
 ) -> dict:
     """
     Run pending jobs for a specific campaign.
@@ -68,7 +68,10 @@ class JobScheduler:
         """
         results: list[JobResult] = []
 
-        with Session(engine) as session:
+        # Jobs commit part-way through (e.g. before image generation); keeping loaded objects
+        # valid across those commits avoids reloads that would reopen a transaction mid-job.
+        # Each job starts from fresh state via expire_all() below instead.
+        with Session(engine, expire_on_commit=False) as session:
             try:
                 # Ensure clean transaction state at start
                 session.rollback()
@@ -84,6 +87,7 @@ class JobScheduler:
                 jobs_processed = 0
                 while jobs_processed < self.config.max_jobs_per_run:
                     try:
+                        session.expire_all()
                         job = orchestrator.get_next_job()
                         if job is None:
                             logger.debug("No more jobs to process")
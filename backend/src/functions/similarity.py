@@ -28,9 +28,10 @@ def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
     if len(vec1) != len(vec2):
         raise ValueError(f"Vectors must have the same length. Got {len(vec1)} and {len(vec2)}")
 
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = math.sqrt(sum(a * a for a in vec1))
-    magnitude2 = math.sqrt(sum(a * a for a in vec2))
+    # sumprod/hypot run in C with extended precision instead of a Python-level loop
+    dot_product = math.sumprod(vec1, vec2)
+    magnitude1 = math.hypot(*vec1)
+    magnitude2 = math.hypot(*vec2)
 
     if magnitude1 == 0 or magnitude2 == 0:
         return 0.0
@@ -3,6 +3,7 @@ import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
+import anyio.to_thread
 import dotenv
 import uvicorn
 from fastapi import FastAPI
@@ -19,11 +20,11 @@ logger = logging.getLogger(__name__)
 
 from sqlmodel import Session, select
 
-from assets.router import process_asset_description_and_embedding
+from assets.router import ASSET_FILES_DIR, process_assets_descriptions_and_embeddings
 from assets.router import router as assets_router
 from campaign_specs.router import router as campaign_specs_router
 from campaigns.router import router as campaigns_router
-from database import create_db_and_tables, engine
+from database import DB_MAX_OVERFLOW, DB_POOL_SIZE, create_db_and_tables, engine
 from functions.router import router as jobs_router
 from functions.scheduler import JobScheduler, SchedulerConfig, run_scheduler_loop
 from models import Asset
@@ -51,10 +52,7 @@ async def backfill_asset_embeddings() -> None:
             return
 
         logger.info(f"Found {len(assets_without_embeddings)} assets to process")
-
-        for i, asset in enumerate(assets_without_embeddings):
-            logger.info(f"Processing asset {i + 1}/{len(assets_without_embeddings)}: {asset.id} ({asset.name})")
-            await process_asset_description_and_embedding(asset, session)
+        await process_assets_descriptions_and_embeddings(assets_without_embeddings, session)
 
     logger.info("Asset embedding backfill complete")
 
@@ -63,7 +61,11 @@ async def backfill_asset_embeddings() -> None:
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     global scheduler_task
 
-    # Startup: create database tables
+    # Sync routes run in anyio's worker threads; allow as many as there are pooled connections
+    anyio.to_thread.current_default_thread_limiter().total_tokens = DB_POOL_SIZE + DB_MAX_OVERFLOW
+
+    # Startup: create the asset file directory and database tables
+    ASSET_FILES_DIR.mkdir(parents=True, exist_ok=True)
     create_db_and_tables()
 
     # Backfill asset embeddings for existing assets
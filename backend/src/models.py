@@ -1,8 +1,8 @@
 import enum
 from datetime import UTC, datetime
-from uuid import UUID, uuid4
+from uuid import UUID, uuid7
 
-from sqlalchemy import ARRAY, Column, Float, String
+from sqlalchemy import ARRAY, Column, Float, Index, String
 from sqlmodel import Field, Relationship, SQLModel
 
 # ---------------------------------------------------------
@@ -42,7 +42,8 @@ class AssetType(str, enum.Enum):
 class BaseModel(SQLModel):
     """Base model with common fields."""
 
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    # Time-ordered ids: rows inserted together land on neighbouring primary key index pages
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
@@ -65,6 +66,9 @@ class AssetBase(SQLModel):
 class Asset(BaseModel, AssetBase, table=True):
     """Asset (image file) - database table model."""
 
+    # Keyset pagination over (created_at, id)
+    __table_args__ = (Index('ix_asset_created_at_id', 'created_at', 'id'),)
+
     # Override fields that need database-specific config
     file_name: str = Field(index=True)
     asset_type: AssetType = Field(index=True)
@@ -87,6 +91,12 @@ class AssetUpdate(SQLModel):
     embedding: list[float] | None = None
 
 
+class AssetBulkUpdate(AssetUpdate):
+    """Schema for applying one partial update to several assets."""
+
+    asset_ids: list[UUID]
+
+
 # ---------------------------------------------------------
 # Link Tables (must be defined before models that use them)
 # ---------------------------------------------------------
@@ -201,3 +211,9 @@ class CampaignSpecUpdate(SQLModel):
     max_iterations: int | None = None
     target_group_ids: list[UUID] | None = None
     asset_ids: list[UUID] | None = None
+
+
+class CampaignSpecAssetIds(SQLModel):
+    """Schema for replacing all asset links of a campaign spec."""
+
+    asset_ids: list[UUID]
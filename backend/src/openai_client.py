@@ -0,0 +1,59 @@
+"""
+Shared OpenAI clients.
+
+Creating a client per call throws away the underlying HTTP connection pool,
+so every request pays for a fresh TCP + TLS handshake. These helpers hand out
+long-lived clients backed by pooled httpx transports instead.
+
+Transient failures (429, 5xx, timeouts, dropped connections) are retried by
+the SDK itself with jittered exponential backoff, so callers only fall back
+once every attempt is exhausted.
+"""
+
+import asyncio
+import weakref
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=60.0,
+)
+
+# Retries after the first attempt; the SDK backs off 0.5s, 1s, 2s, 4s (+ jitter, honouring Retry-After)
+MAX_RETRIES = 4
+
+# Per-request timeout in seconds (vision calls on large images can be slow)
+REQUEST_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI] = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Return the process-wide synchronous OpenAI client (uses OPENAI_API_KEY)."""
+    return OpenAI(
+        http_client=httpx.Client(limits=HTTP_LIMITS),
+        max_retries=MAX_RETRIES,
+        timeout=REQUEST_TIMEOUT,
+    )
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Return the AsyncOpenAI client bound to the running event loop.
+
+    httpx async pools cannot be shared across event loops, so one client is kept per loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            http_client=httpx.AsyncClient(limits=HTTP_LIMITS),
+            max_retries=MAX_RETRIES,
+            timeout=REQUEST_TIMEOUT,
+        )
+        _async_clients[loop] = client
+    return client
@@ -146,30 +146,82 @@ def poll_flux_result(
     FluxGenerationError
         If the API reports an error status or polling times out.
     """
+    return poll_flux_results([(polling_url, request_id)], timeout=timeout, interval=interval)[0]
+
+
+def poll_flux_results(
+    jobs: list[tuple[str, str | None]],
+    timeout: float = 120.0,
+    interval: float = 0.5,
+) -> list[dict[str, Any]]:
+    """
+    Poll several FLUX.2 jobs until all of them are 'Ready' or one fails.
+
+    Each sweep checks every pending job once, then sleeps `interval`, so jobs
+    that render concurrently on the API side are collected together.
+
+    `timeout` applies per job, not to the whole batch: the clock restarts
+    whenever a job becomes ready, so polling only fails once no pending job
+    has finished for `timeout` seconds. A batch therefore gets the same budget
+    as polling its jobs one after another, even when the API queues them.
+
+    Parameters
+    ----------
+    jobs : list of (polling_url, request_id) tuples
+        Jobs as returned by `call_flux_edit`.
+    timeout : float, optional
+        Maximum number of seconds to wait for the next job to become ready. Default is 120.
+    interval : float, optional
+        Delay (in seconds) between polling sweeps. Default is 0.5.
+
+    Returns
+    -------
+    list
+        Final JSON results, in the same order as `jobs`.
+
+    Raises
+    ------
+    FluxGenerationError
+        If the API reports an error status for any job or polling times out.
+    """
     if not BFL_API_KEY:
         raise FluxGenerationError("BFL_API_KEY environment variable is not set.")
 
-    start = time.time()
+    results: list[dict[str, Any] | None] = [None] * len(jobs)
+    pending = list(range(len(jobs)))
+    deadline = time.time() + timeout
     while True:
-        params = {"id": request_id} if request_id else None
-        result = requests.get(
-            polling_url,
-            headers={
-                "accept": "application/json",
-                "x-key": BFL_API_KEY,
-            },
-            params=params,
-            timeout=60,
-        ).json()
-
-        status = result.get("status")
-
-        if status == "Ready":
-            return result
-        if status in ("Failed", "Error"):
-            raise FluxGenerationError(f"FLUX.2 job failed: {result}")
-
-        if (time.time() - start) > timeout:
+        still_pending = []
+        for idx in pending:
+            polling_url, request_id = jobs[idx]
+            params = {"id": request_id} if request_id else None
+            result = requests.get(
+                polling_url,
+                headers={
+                    "accept": "application/json",
+                    "x-key": BFL_API_KEY,
+                },
+                params=params,
+                timeout=60,
+            ).json()
+
+            status = result.get("status")
+
+            if status == "Ready":
+                results[idx] = result
+            elif status in ("Failed", "Error"):
+                raise FluxGenerationError(f"FLUX.2 job failed: {result}")
+            else:
+                still_pending.append(idx)
+
+        if not still_pending:
+            return results  # type: ignore[return-value]
+        if len(still_pending) < len(pending):
+            # A job finished; the next one gets a full timeout of its own
+            deadline = time.time() + timeout
+        pending = still_pending
+
+        if time.time() > deadline:
             raise FluxGenerationError("Polling timed out before result was ready.")
 
         time.sleep(interval)
@@ -405,8 +457,13 @@ def build_prompt(
 class FluxBatchSession:
     """Stateful helper that keeps asset metadata and usage tracking."""
 
-    def __init__(self, assets_base_dir: str):
-        self.assets = load_assets_from_folder(assets_base_dir)
+    def __init__(
+        self,
+        assets_base_dir: str,
+        assets: dict[str, list[dict[str, Any]]] | None = None,
+    ):
+        # A pre-scanned asset catalog (as returned by load_assets_from_folder) skips the directory scan
+        self.assets = assets if assets is not None else load_assets_from_folder(assets_base_dir)
         self.used_ids_per_class: dict[str, set[str]] = {}
 
     def generate_images_for_group(
@@ -454,73 +511,139 @@ class FluxBatchSession:
         FluxGenerationError
             If any FLUX.2 call fails.
         """
-        group_results: list[dict[str, Any]] = []
+        return self.generate_images_batched(
+            [(target_group, base_prompt, preferred_asset_ids)],
+            num_images=num_images,
+            width=width,
+            height=height,
+        )[target_group]
+
+    def generate_images_batched(
+        self,
+        batch: list[tuple[str, str, dict[str, set[str]] | None]],
+        num_images: int = 5,
+        width: int = 1024,
+        height: int = 1024,
+        *,
+        poll_timeout: float = 120.0,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Generate edited images for several target groups in one batch.
 
-        logger.info(
-            "Generating %s images for %s", num_images, target_group
-        )
+        Every request of the batch is submitted before any is polled, so the
+        FLUX.2 API renders them concurrently instead of one submit/poll round
+        trip after another. Assets are selected in the same order as calling
+        `generate_images_for_group` once per group.
 
-        for idx in range(num_images):
-            selected_assets = select_assets_for_image(
-                self.assets,
-                self.used_ids_per_class,
-                allowed_ids_per_class=preferred_asset_ids,
-            )
-            (base_class, base_asset), reference_assets = choose_base_and_references(
-                selected_assets
-            )
+        Parameters
+        ----------
+        batch : list of (target_group, base_prompt, preferred_asset_ids) tuples
+            One entry per group; see `generate_images_for_group`.
+        num_images : int, optional
+            Number of edited images to generate per target group. Default is 5.
+        width : int, optional
+            Output width in pixels. Default is 1024.
+        height : int, optional
+            Output height in pixels. Default is 1024.
+        poll_timeout : float, optional
+            Seconds to wait for each image, passed to `poll_flux_results`. Default is 120.
 
-            base_b64 = encode_image_to_base64(base_asset["file_path"])
-            refs_b64 = [
-                encode_image_to_base64(a["file_path"]) for _, a in reference_assets
-            ]
+        Returns
+        -------
+        dict
+            Mapping target_group -> list of image result dicts, as returned by
+            `generate_images_for_group`.
 
-            prompt = build_prompt(
-                base_prompt=base_prompt,
-                selected_assets=selected_assets,
-                base_asset_class=base_class,
-            )
+        Raises
+        ------
+        FluxGenerationError
+            If any FLUX.2 call fails.
+        """
+        submitted: list[dict[str, Any]] = []
 
-            initial = call_flux_edit(
-                prompt=prompt,
-                input_image_b64=base_b64,
-                reference_images_b64=refs_b64,
-                width=width,
-                height=height,
+        for target_group, base_prompt, preferred_asset_ids in batch:
+            logger.info(
+                "Generating %s images for %s", num_images, target_group
             )
 
-            polling_url = initial.get("polling_url")
-            request_id = initial.get("id")
-            cost = initial.get("cost")
+            for _ in range(num_images):
+                selected_assets = select_assets_for_image(
+                    self.assets,
+                    self.used_ids_per_class,
+                    allowed_ids_per_class=preferred_asset_ids,
+                )
+                (base_class, base_asset), reference_assets = choose_base_and_references(
+                    selected_assets
+                )
+
+                base_b64 = encode_image_to_base64(base_asset["file_path"])
+                refs_b64 = [
+                    encode_image_to_base64(a["file_path"]) for _, a in reference_assets
+                ]
+
+                prompt = build_prompt(
+                    base_prompt=base_prompt,
+                    selected_assets=selected_assets,
+                    base_asset_class=base_class,
+                )
+
+                initial = call_flux_edit(
+                    prompt=prompt,
+                    input_image_b64=base_b64,
+                    reference_images_b64=refs_b64,
+                    width=width,
+                    height=height,
+                )
+
+                polling_url = initial.get("polling_url")
+                request_id = initial.get("id")
+
+                if not polling_url:
+                    raise FluxGenerationError(
+                        f"No polling_url in response for request {request_id}"
+                    )
 
-            if not polling_url:
-                raise FluxGenerationError(
-                    f"No polling_url in response for request {request_id}"
+                submitted.append(
+                    {
+                        "prompt": prompt,
+                        "target_group": target_group,
+                        "assets": selected_assets,
+                        "base_class": base_class,
+                        "polling_url": polling_url,
+                        "request_id": request_id,
+                        "cost": initial.get("cost"),
+                    }
                 )
 
-            final = poll_flux_result(polling_url=polling_url, request_id=request_id)
-            sample_url = final.get("result", {}).get("sample")
+        finals = poll_flux_results(
+            [(job["polling_url"], job["request_id"]) for job in submitted],
+            timeout=poll_timeout,
+        )
 
+        results: dict[str, list[dict[str, Any]]] = {group: [] for group, _, _ in batch}
+        for job, final in zip(submitted, finals, strict=True):
+            target_group = job["target_group"]
+            group_results = results[target_group]
             group_results.append(
                 {
-                    "prompt": prompt,
+                    "prompt": job["prompt"],
                     "target_group": target_group,
-                    "assets": selected_assets,
-                    "base_class": base_class,
-                    "image_url": sample_url,
-                    "request_id": request_id,
-                    "cost": cost,
+                    "assets": job["assets"],
+                    "base_class": job["base_class"],
+                    "image_url": final.get("result", {}).get("sample"),
+                    "request_id": job["request_id"],
+                    "cost": job["cost"],
                 }
             )
             logger.info(
                 "[%s] Generated image %s/%s (request %s)",
                 target_group,
-                idx + 1,
+                len(group_results),
                 num_images,
-                request_id,
+                job["request_id"],
             )
 
-        return group_results
+        return results
 
 
 def print_concise_summary(results: dict[str, list[dict[str, Any]]]) -> None:
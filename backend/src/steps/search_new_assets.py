@@ -1,3 +1,4 @@
+import heapq
 import logging
 import math
 from uuid import UUID
@@ -5,15 +6,18 @@ from uuid import UUID
 from sqlmodel import Session, select
 
 try:
-    from ..assets.create_embedding import create_embedding
+    from ..assets.create_embedding import create_embedding, create_embeddings_batch
     from ..models import Asset, AssetType
 except ImportError:  # pragma: no cover - fallback for standalone scripts
-    from assets.create_embedding import create_embedding  # type: ignore
+    from assets.create_embedding import create_embedding, create_embeddings_batch  # type: ignore
     from models import Asset, AssetType  # type: ignore
 
 DEFAULT_EMBEDDING_MODEL = 'text-embedding-3-small'
 DEFAULT_TOP_K = 5
 
+# Rows fetched per round trip while scanning asset embeddings
+ASSET_SCAN_BATCH_SIZE = 256
+
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +36,10 @@ def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
     if len(vec1) != len(vec2):
         raise ValueError(f"Vectors must have the same length. Got {len(vec1)} and {len(vec2)}")
 
-    dot_product = sum(a * b for a, b in zip(vec1, vec2))
-    magnitude1 = math.sqrt(sum(a * a for a in vec1))
-    magnitude2 = math.sqrt(sum(a * a for a in vec2))
+    # sumprod/hypot run in C with extended precision instead of a Python-level loop
+    dot_product = math.sumprod(vec1, vec2)
+    magnitude1 = math.hypot(*vec1)
+    magnitude2 = math.hypot(*vec2)
 
     if magnitude1 == 0 or magnitude2 == 0:
         return 0.0
@@ -70,6 +75,9 @@ def search_new_assets(
     Returns:
         List of tuples (Asset, similarity_score) sorted by similarity (highest first)
     """
+    if top_k <= 0:
+        return []
+
     # Get prompt embedding
     if prompt_embedding is None:
         if prompt is None or not prompt.strip():
@@ -83,6 +91,52 @@ def search_new_assets(
     if not prompt_embedding:
         raise ValueError("Prompt embedding cannot be empty")
 
+    results = _scan_top_k(session, [prompt_embedding], top_k, asset_type)[0]
+    logger.info("Returning %s similar assets", len(results))
+    return results
+
+
+def search_new_assets_batch(
+    session: Session,
+    prompts: list[str],
+    top_k: int = DEFAULT_TOP_K,
+    asset_type: AssetType | None = None,
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+) -> list[list[tuple[Asset, float]]]:
+    """
+    Search for the assets most similar to each of several prompts.
+
+    All prompts are embedded in one batched request and scored in a single pass
+    over the asset table, instead of one embedding call and one scan per prompt.
+
+    Returns:
+        One list of (Asset, similarity_score) tuples per prompt, in input order,
+        each sorted by similarity (highest first)
+    """
+    if not prompts:
+        return []
+    texts = [prompt.strip() if prompt else '' for prompt in prompts]
+    if not all(texts):
+        raise ValueError("All prompts must be non-empty")
+
+    try:
+        prompt_embeddings = create_embeddings_batch(texts, embedding_model)
+    except Exception as e:
+        raise RuntimeError(f"Failed to create embeddings for prompts: {e}") from e
+
+    return _scan_top_k(session, prompt_embeddings, top_k, asset_type)
+
+
+def _scan_top_k(
+    session: Session,
+    query_embeddings: list[list[float]],
+    top_k: int,
+    asset_type: AssetType | None,
+) -> list[list[tuple[Asset, float]]]:
+    """Score every asset with an embedding against each query in one streamed pass, keeping the top K per query."""
+    if top_k <= 0:
+        return [[] for _ in query_embeddings]
+
     # Query assets with embeddings
     # SQLModel columns support isnot() method directly
     statement = select(Asset).where(Asset.embedding.isnot(None))
@@ -90,42 +144,45 @@ def search_new_assets(
     if asset_type:
         statement = statement.where(Asset.asset_type == asset_type)
 
-    assets = list(session.exec(statement).all())
-
-    if not assets:
-        logger.info("No assets with embeddings available for search")
-        return []
-
-    # Compute similarity scores
-    scored_assets: list[tuple[Asset, float]] = []
-
     logger.info(
-        "Computing similarity against %s assets (top_k=%s)", len(assets), top_k
+        "Computing similarity of %s queries against assets with embeddings (top_k=%s)",
+        len(query_embeddings),
+        top_k,
     )
 
-    for asset in assets:
+    # Min-heaps of (score, scan position, asset); the position breaks ties without comparing assets
+    heaps: list[list[tuple[float, int, Asset]]] = [[] for _ in query_embeddings]
+
+    # Stream rows in batches instead of materializing the whole table
+    assets = session.exec(statement.execution_options(yield_per=ASSET_SCAN_BATCH_SIZE))
+    for position, asset in enumerate(assets):
         # Double-check embedding exists (defensive programming)
         if asset.embedding is None or len(asset.embedding) == 0:
             continue
 
-        try:
-            similarity = cosine_similarity(prompt_embedding, asset.embedding)
-            scored_assets.append((asset, similarity))
-        except ValueError as e:
-            # Skip assets with incompatible embedding dimensions
-            logger.warning(
-                "Skipping asset %s due to embedding dimension mismatch: %s",
-                asset.id,
-                e,
-            )
-            continue
-
-    # Sort by similarity (highest first) and return top K
-    scored_assets.sort(key=lambda x: x[1], reverse=True)
+        for heap, query in zip(heaps, query_embeddings, strict=True):
+            try:
+                entry = (cosine_similarity(query, asset.embedding), position, asset)
+            except ValueError as e:
+                # Skip assets with incompatible embedding dimensions
+                logger.warning(
+                    "Skipping asset %s due to embedding dimension mismatch: %s",
+                    asset.id,
+                    e,
+                )
+                continue
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+    if not any(heaps):
+        logger.info("No assets with embeddings available for search")
 
-    results = scored_assets[:top_k]
-    logger.info("Returning %s similar assets", len(results))
-    return results
+    return [
+        [(asset, score) for score, _, asset in sorted(heap, key=lambda e: (-e[0], e[1]))]
+        for heap in heaps
+    ]
 
 
 def search_new_assets_by_ids(
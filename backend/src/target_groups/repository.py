@@ -15,7 +15,6 @@ class TargetGroupRepository:
         """Persist a new target group to the database."""
         self.session.add(target_group)
         self.session.commit()
-        self.session.refresh(target_group)
         return target_group
 
     def get_by_id(self, target_group_id: UUID) -> TargetGroup | None:
@@ -31,7 +30,6 @@ class TargetGroupRepository:
         """Update an existing target group."""
         self.session.add(target_group)
         self.session.commit()
-        self.session.refresh(target_group)
         return target_group
 
     def delete(self, target_group: TargetGroup) -> None:
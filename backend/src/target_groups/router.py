@@ -3,6 +3,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 
+from campaign_specs.cache import invalidate_spec_cache
 from database import get_session
 from models import TargetGroup, TargetGroupCreate, TargetGroupUpdate
 from target_groups.repository import TargetGroupRepository
@@ -11,7 +12,7 @@ from target_groups.service import TargetGroupNotFoundError, TargetGroupService
 router = APIRouter(prefix='/target-groups', tags=['target-groups'])
 
 
-def get_target_group_service(session: Session = Depends(get_session)) -> TargetGroupService:
+def get_target_group_service(session: Session = Depends(get_session, scope='function')) -> TargetGroupService:
     """Dependency injection for TargetGroupService."""
     repository = TargetGroupRepository(session)
     return TargetGroupService(repository)
@@ -48,7 +49,7 @@ def get_target_group(
         raise HTTPException(status_code=404, detail='Target group not found')
 
 
-@router.patch('/{target_group_id}', response_model=TargetGroup)
+@router.patch('/{target_group_id}', response_model=TargetGroup, dependencies=[Depends(invalidate_spec_cache)])
 def update_target_group(
     target_group_id: UUID,
     data: TargetGroupUpdate,
@@ -61,7 +62,7 @@ def update_target_group(
         raise HTTPException(status_code=404, detail='Target group not found')
 
 
-@router.delete('/{target_group_id}', status_code=204)
+@router.delete('/{target_group_id}', status_code=204, dependencies=[Depends(invalidate_spec_cache)])
 def delete_target_group(
     target_group_id: UUID,
     service: TargetGroupService = Depends(get_target_group_service),
@@ -0,0 +1,76 @@
+"""
+Tests for the in-memory normalized-text LRU in assets cache module.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+backend_dir = Path(__file__).parent.parent
+src_dir = backend_dir / 'src'
+sys.path.insert(0, str(src_dir))
+
+from assets.cache import _NormalizedLRU  # noqa: E402
+
+
+class TestSimilarityLRU:
+    """Test suite for _NormalizedLRU."""
+
+    def test_exact_hit(self) -> None:
+        """A stored text is returned as-is."""
+        lru = _NormalizedLRU(capacity=10)
+        lru.put('red sneakers on a white background', 'model', [1.0])
+
+        assert lru.get('red sneakers on a white background', 'model') == [1.0]
+
+    def test_whitespace_and_case_are_normalized(self) -> None:
+        """Texts differing only in whitespace or casing share an entry."""
+        lru = _NormalizedLRU(capacity=10)
+        lru.put('Red  sneakers\non a white background', 'model', [1.0])
+
+        assert lru.get('red sneakers on a WHITE background ', 'model') == [1.0]
+
+    def test_different_text_misses(self) -> None:
+        """A different text is a miss."""
+        lru = _NormalizedLRU(capacity=10)
+        lru.put('red sneakers on a white background', 'model', [1.0])
+
+        assert lru.get('a blue jacket hanging in a dark closet', 'model') is None
+
+    @pytest.mark.parametrize(
+        ('stored', 'looked_up'),
+        [
+            (
+                'A bright living room with plants in the corner, no people in the background',
+                'A bright living room with plants in the corner, two people in the background',
+            ),
+            ('Leather boots on a wooden floor, priced at $120', 'Leather boots on a wooden floor, priced at $180'),
+        ],
+    )
+    def test_nearly_identical_text_with_another_meaning_misses(self, stored: str, looked_up: str) -> None:
+        """Texts differing by a word or a number never share an embedding."""
+        lru = _NormalizedLRU(capacity=10)
+        lru.put(stored, 'model', [1.0])
+
+        assert lru.get(looked_up, 'model') is None
+
+    def test_models_are_kept_apart(self) -> None:
+        """An entry for one model never serves another."""
+        lru = _NormalizedLRU(capacity=10)
+        lru.put('red sneakers', 'small', [1.0])
+
+        assert lru.get('red sneakers', 'large') is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Past capacity the least recently used entry is dropped; a hit refreshes an entry."""
+        lru = _NormalizedLRU(capacity=2)
+        lru.put('first text', 'model', [1.0])
+        lru.put('second text', 'model', [2.0])
+        assert lru.get('first text', 'model') == [1.0]
+
+        lru.put('third text', 'model', [3.0])
+
+        assert lru.get('first text', 'model') == [1.0]
+        assert lru.get('second text', 'model') is None
+        assert lru.get('third text', 'model') == [3.0]
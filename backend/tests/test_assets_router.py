@@ -0,0 +1,52 @@
+"""
+Tests for the keyset pagination cursor in assets router module.
+"""
+import sys
+from datetime import UTC, datetime
+from http import HTTPStatus
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+# Add src to path for imports
+backend_dir = Path(__file__).parent.parent
+src_dir = backend_dir / 'src'
+sys.path.insert(0, str(src_dir))
+
+from assets.router import _decode_cursor, _encode_cursor  # noqa: E402
+
+
+class TestCursor:
+    """Test suite for _encode_cursor and _decode_cursor."""
+
+    @pytest.mark.parametrize(
+        'created_at',
+        [
+            datetime(2026, 3, 1, 12, 30, 45, 123456),
+            datetime(2026, 3, 1, 12, 30, 45, tzinfo=UTC),
+        ],
+    )
+    def test_round_trip(self, created_at: datetime) -> None:
+        """Decoding an encoded cursor gives back the asset's (created_at, id)."""
+        asset = SimpleNamespace(id=uuid4(), created_at=created_at)
+
+        assert _decode_cursor(_encode_cursor(asset)) == (asset.created_at, asset.id)
+
+    @pytest.mark.parametrize(
+        'cursor',
+        [
+            '',
+            'not-a-cursor',
+            f'yesterday_{uuid4()}',
+            '2026-03-01T12:30:45_not-a-uuid',
+        ],
+    )
+    def test_invalid_cursor_is_a_bad_request(self, cursor: str) -> None:
+        """Malformed cursors are rejected with 400 instead of a server error."""
+        with pytest.raises(HTTPException) as exc_info:
+            _decode_cursor(cursor)
+
+        assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,97 @@
+"""
+Tests for the campaign spec ResponseCache.
+"""
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add src to path for imports
+backend_dir = Path(__file__).parent.parent
+src_dir = backend_dir / 'src'
+sys.path.insert(0, str(src_dir))
+
+from campaign_specs.cache import ResponseCache  # noqa: E402
+
+
+@pytest.fixture
+def clock() -> Iterator[MagicMock]:
+    """Patch the cache's monotonic clock; set clock.return_value to move time."""
+    with patch('campaign_specs.cache.time.monotonic', return_value=100.0) as mock_monotonic:
+        yield mock_monotonic
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache."""
+
+    def test_hit_within_ttl(self, clock: MagicMock) -> None:
+        """A second read inside the TTL is served without recomputing."""
+        cache = ResponseCache(ttl=30.0)
+        compute = MagicMock(return_value=b'[]')
+
+        assert cache.get_or_compute('key', compute) == b'[]'
+        clock.return_value = 129.0
+        assert cache.get_or_compute('key', compute) == b'[]'
+
+        compute.assert_called_once()
+
+    def test_expires_after_ttl(self, clock: MagicMock) -> None:
+        """Once the TTL has passed the value is recomputed."""
+        cache = ResponseCache(ttl=30.0)
+        compute = MagicMock(side_effect=[b'old', b'new'])
+
+        assert cache.get_or_compute('key', compute) == b'old'
+        clock.return_value = 130.0
+        assert cache.get_or_compute('key', compute) == b'new'
+
+    def test_keys_are_independent(self, clock: MagicMock) -> None:
+        """Different keys are cached separately."""
+        cache = ResponseCache()
+
+        assert cache.get_or_compute(('spec', 1), lambda: 'one') == 'one'
+        assert cache.get_or_compute(('spec', 2), lambda: 'two') == 'two'
+        assert cache.get_or_compute(('spec', 1), lambda: 'other') == 'one'
+
+    def test_invalidate_drops_every_entry(self, clock: MagicMock) -> None:
+        """invalidate() forces every key to be recomputed."""
+        cache = ResponseCache()
+        cache.get_or_compute('a', lambda: 'a1')
+        cache.get_or_compute('b', lambda: 'b1')
+
+        cache.invalidate()
+
+        assert cache.get_or_compute('a', lambda: 'a2') == 'a2'
+        assert cache.get_or_compute('b', lambda: 'b2') == 'b2'
+
+    def test_read_racing_a_write_is_not_stored(self, clock: MagicMock) -> None:
+        """A value computed before an invalidation is returned but not cached."""
+        cache = ResponseCache()
+
+        def compute_stale() -> str:
+            # A write commits while this read is still running
+            cache.invalidate()
+            return 'stale'
+
+        assert cache.get_or_compute('key', compute_stale) == 'stale'
+        assert cache.get_or_compute('key', lambda: 'fresh') == 'fresh'
+
+    def test_exceptions_are_not_cached(self, clock: MagicMock) -> None:
+        """A failing compute propagates and the next read tries again."""
+        cache = ResponseCache()
+
+        with pytest.raises(LookupError):
+            cache.get_or_compute('key', MagicMock(side_effect=LookupError))
+
+        assert cache.get_or_compute('key', lambda: 'value') == 'value'
+
+    def test_oldest_entry_is_evicted_when_full(self, clock: MagicMock) -> None:
+        """At max_entries the oldest entry makes room for the new one."""
+        cache = ResponseCache(max_entries=2)
+        cache.get_or_compute('a', lambda: 'a1')
+        cache.get_or_compute('b', lambda: 'b1')
+        cache.get_or_compute('c', lambda: 'c1')
+
+        assert cache.get_or_compute('a', lambda: 'a2') == 'a2'
+        assert cache.get_or_compute('c', lambda: 'c2') == 'c1'
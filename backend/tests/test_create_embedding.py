@@ -0,0 +1,56 @@
+"""
+Tests for request batching in create_embedding module.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for imports
+backend_dir = Path(__file__).parent.parent
+src_dir = backend_dir / 'src'
+sys.path.insert(0, str(src_dir))
+
+from assets.create_embedding import _chunk_texts  # noqa: E402
+
+
+class TestChunkTexts:
+    """Test suite for _chunk_texts function."""
+
+    def test_empty_input(self) -> None:
+        """No texts means no requests."""
+        assert _chunk_texts([]) == []
+
+    def test_small_input_is_one_batch(self) -> None:
+        """Texts under both limits go out in a single request, in order."""
+        texts = ['red sneakers', 'blue jacket', 'green hat']
+
+        assert _chunk_texts(texts) == [texts]
+
+    def test_splits_on_input_count(self) -> None:
+        """A batch is closed once it holds MAX_BATCH_INPUTS texts."""
+        texts = [f'text {i}' for i in range(7)]
+
+        with patch('assets.create_embedding.MAX_BATCH_INPUTS', 3):
+            batches = _chunk_texts(texts)
+
+        assert batches == [texts[0:3], texts[3:6], texts[6:7]]
+
+    def test_splits_on_token_budget(self) -> None:
+        """A text that would push the estimated tokens over the budget starts a new batch."""
+        # 39 characters estimate to 39 // 4 + 1 = 10 tokens each
+        texts = ['x' * 39] * 5
+
+        with patch('assets.create_embedding.MAX_BATCH_TOKENS', 25):
+            batches = _chunk_texts(texts)
+
+        assert batches == [texts[0:2], texts[2:4], texts[4:5]]
+
+    def test_oversized_text_gets_its_own_batch(self) -> None:
+        """A single text above the budget is still sent, alone, rather than dropped."""
+        texts = ['short', 'x' * 400, 'short']
+
+        with patch('assets.create_embedding.MAX_BATCH_TOKENS', 20):
+            batches = _chunk_texts(texts)
+
+        assert batches == [['short'], ['x' * 400], ['short']]
+        assert [text for batch in batches for text in batch] == texts
@@ -0,0 +1,98 @@
+"""
+Tests for the top-K embedding scan in search_new_assets module.
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+# Add src to path for imports
+backend_dir = Path(__file__).parent.parent
+src_dir = backend_dir / 'src'
+sys.path.insert(0, str(src_dir))
+
+from steps.search_new_assets import _scan_top_k, search_new_assets  # noqa: E402
+
+
+def make_asset(embedding: list[float] | None) -> SimpleNamespace:
+    """Create a stand-in asset row; the scan only reads id and embedding."""
+    return SimpleNamespace(id=uuid4(), embedding=embedding)
+
+
+def make_session(assets: list[SimpleNamespace]) -> MagicMock:
+    """Create a session whose exec() streams the given assets."""
+    session = MagicMock()
+    session.exec.return_value = iter(assets)
+    return session
+
+
+class TestScanTopK:
+    """Test suite for _scan_top_k function."""
+
+    def test_keeps_top_k_per_query_sorted_by_score(self) -> None:
+        """Each query gets its own best matches, highest similarity first."""
+        east = make_asset([1.0, 0.0])
+        north = make_asset([0.0, 1.0])
+        diagonal = make_asset([0.7, 0.7])
+        session = make_session([east, north, diagonal])
+
+        results = _scan_top_k(session, [[1.0, 0.0], [0.0, 1.0]], 2, None)
+
+        assert [asset for asset, _ in results[0]] == [east, diagonal]
+        assert [asset for asset, _ in results[1]] == [north, diagonal]
+        assert results[0][0][1] == pytest.approx(1.0)
+        assert results[0][0][1] >= results[0][1][1]
+
+    def test_ties_keep_scan_order(self) -> None:
+        """Equal scores are ordered by scan position instead of comparing assets."""
+        first = make_asset([1.0, 0.0])
+        second = make_asset([2.0, 0.0])
+        session = make_session([first, second])
+
+        results = _scan_top_k(session, [[1.0, 0.0]], 2, None)
+
+        assert [asset for asset, _ in results[0]] == [first, second]
+
+    def test_skips_missing_and_mismatched_embeddings(self) -> None:
+        """Assets without an embedding or with another dimension are ignored."""
+        valid = make_asset([1.0, 0.0])
+        session = make_session([make_asset(None), make_asset([]), make_asset([1.0, 0.0, 0.0]), valid])
+
+        results = _scan_top_k(session, [[1.0, 0.0]], 5, None)
+
+        assert [asset for asset, _ in results[0]] == [valid]
+
+    def test_no_assets(self) -> None:
+        """An empty table yields one empty result list per query."""
+        results = _scan_top_k(make_session([]), [[1.0, 0.0], [0.0, 1.0]], 3, None)
+
+        assert results == [[], []]
+
+    @pytest.mark.parametrize('top_k', [0, -1])
+    def test_non_positive_top_k_returns_empty_without_querying(self, top_k: int) -> None:
+        """A top_k of zero or less returns empty results and never touches the database."""
+        session = make_session([make_asset([1.0, 0.0])])
+
+        results = _scan_top_k(session, [[1.0, 0.0], [0.0, 1.0]], top_k, None)
+
+        assert results == [[], []]
+        session.exec.assert_not_called()
+
+
+class TestSearchNewAssets:
+    """Test suite for search_new_assets function."""
+
+    @pytest.mark.parametrize('top_k', [0, -1])
+    def test_non_positive_top_k_skips_embedding_and_scan(self, top_k: int) -> None:
+        """No embedding is created and no rows are read when nothing can be returned."""
+        session = make_session([make_asset([1.0, 0.0])])
+
+        with patch('steps.search_new_assets.create_embedding') as mock_create_embedding:
+            results = search_new_assets(session, prompt='red sneakers', top_k=top_k)
+
+        assert results == []
+        mock_create_embedding.assert_not_called()
+        session.exec.assert_not_called()